@@ -1,9 +1,17 @@
 from django.contrib import admin
-from .models import Task, PeerReview
+from .models import AIGenerationJob, Task, PeerReview
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ('title', 'project', 'status', 'assigned_to')
     list_filter = ('status', 'project')
 
-admin.site.register(PeerReview)
\ No newline at end of file
+@admin.register(PeerReview)
+class PeerReviewAdmin(admin.ModelAdmin):
+    list_display = ('reviewee', 'reviewer', 'rating', 'sentiment', 'flagged', 'moderated_at')
+    list_filter = ('flagged',)
+
+@admin.register(AIGenerationJob)
+class AIGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'project', 'status', 'attempts', 'created_count', 'run_after', 'updated_at')
+    list_filter = ('status',)
@@ -0,0 +1,240 @@
+# collaboration/ai.py
+# Gemini task generation: prompt, HTTP call (plain or streamed) and response parsing.
+# Still a direct REST call (no Google SDK); the base URL is configurable so
+# it can point at a local fake server (manage.py fake_gemini) offline.
+import http.client
+import json
+import re
+
+from django.conf import settings
+
+from .llm import ClientBusy, get_client
+
+GEMINI_TIMEOUT = getattr(settings, 'GEMINI_TIMEOUT', 30)
+
+
+class GeminiError(Exception):
+    """A generation attempt failed; ``retryable`` says whether to try again."""
+    retryable = True
+
+
+class GeminiRejected(GeminiError):
+    # Bad key, bad request, quota disabled... retrying won't help
+    retryable = False
+
+
+def build_prompt(project):
+    return f"""
+        Act as a senior software architect.
+        Break down the project into 5-7 actionable student tasks.
+
+        For each task, provide:
+        1. A 'title' (short, descriptive).
+        2. A 'guide' (one paragraph) explaining how to do it and why.
+
+        Project: {project.title} - {project.description}
+
+        Return ONLY a JSON list of objects. Do not use markdown backticks.
+        [
+            {{"title": "Setup Git", "guide": "Initialize a repository..."}},
+            {{"title": "Base Layout", "guide": "Create the base.html template..."}}
+        ]
+        """
+
+
+def _request(prompt, stream=False):
+    # The key travels in a header, not the URL; the client hashes it into the cache key
+    method = 'streamGenerateContent?alt=sse' if stream else 'generateContent'
+    url = f"{settings.GEMINI_API_URL}:{method}"
+    # Structuring the exact payload Google expects
+    payload = {
+        "contents": [{"parts": [{"text": prompt}]}]
+    }
+    return url, payload
+
+
+def forget_response(api_key, prompt, stream=False):
+    """Evict a cached answer that turned out to be unusable, so a retry asks again."""
+    get_client().forget(*_request(prompt, stream), api_key=(api_key or '').strip())
+
+
+def _raise_for_status(status, body):
+    # Keep Google's exact rejection reason for the job's error field
+    error_body = body.decode('utf-8', 'replace')
+    error_class = GeminiError if status == 429 or status >= 500 else GeminiRejected
+    raise error_class(f"HTTP {status}: {error_body}")
+
+
+def generate_content(api_key, prompt, timeout=None):
+    """Call generateContent and return the text of the first candidate.
+
+    Goes through the shared LLM client: pooled connections, per-key rate
+    limit and a response cache, so the same prompt is only sent once per TTL.
+    """
+    url, payload = _request(prompt)
+    try:
+        status, body = get_client().post_json(
+            url, payload,
+            api_key=api_key.strip(),
+            headers={'x-goog-api-key': api_key.strip()},
+            timeout=timeout or GEMINI_TIMEOUT,
+        )
+    except ClientBusy as e:
+        raise GeminiError(str(e)) from e
+    except (OSError, http.client.HTTPException) as e:
+        raise GeminiError(str(e) or e.__class__.__name__) from e
+
+    if status != 200:
+        _raise_for_status(status, body)
+
+    try:
+        result = json.loads(body.decode('utf-8'))
+        # Digging into the JSON response to grab the text
+        return result['candidates'][0]['content']['parts'][0]['text']
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        get_client().forget(url, payload, api_key=api_key.strip())
+        raise GeminiError(f"Unexpected response: {body[:500]!r}") from e
+
+
+def stream_content(api_key, prompt, timeout=None):
+    """Call streamGenerateContent and yield the text as it is generated.
+
+    ``timeout`` bounds each wait for more data, not the whole generation.
+    """
+    url, payload = _request(prompt, stream=True)
+    try:
+        status, lines = get_client().post_json_lines(
+            url, payload,
+            api_key=api_key.strip(),
+            headers={'x-goog-api-key': api_key.strip()},
+            timeout=timeout or GEMINI_TIMEOUT,
+        )
+    except ClientBusy as e:
+        raise GeminiError(str(e)) from e
+    except (OSError, http.client.HTTPException) as e:
+        raise GeminiError(str(e) or e.__class__.__name__) from e
+
+    try:
+        if status != 200:
+            _raise_for_status(status, b''.join(lines))
+        # Server-sent events: one "data: {...}" line per chunk of the answer
+        for line in lines:
+            line = line.strip()
+            if not line.startswith(b'data:'):
+                continue
+            try:
+                chunk = json.loads(line[5:])
+                parts = chunk['candidates'][0]['content']['parts']
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                raise GeminiError(f"Unexpected stream chunk: {line[:500]!r}") from e
+            for part in parts:
+                if part.get('text'):
+                    yield part['text']
+    except (OSError, http.client.HTTPException) as e:
+        raise GeminiError(str(e) or e.__class__.__name__) from e
+    finally:
+        close = getattr(lines, 'close', None)
+        if close is not None:
+            close()
+
+
+def _clean_task(item):
+    if isinstance(item, dict) and item.get('title'):
+        return {'title': str(item['title'])[:200], 'guide': str(item.get('guide', ''))}
+    return None
+
+
+class TaskStreamParser:
+    """Incremental parser for a JSON array of task objects arriving in pieces.
+
+    ``feed()`` returns the tasks completed by the new text. Only the
+    unfinished tail is kept, and it is never rescanned. A malformed object
+    is skipped without losing the ones before or after it, and anything
+    after the closing ``]`` (or a missing one) is ignored.
+    """
+    _interesting = re.compile(r'[\[\]{}"\\]')
+    _in_string = re.compile(r'["\\]')
+
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0
+        self.depth = 0
+        self.start = None
+        self.in_string = False
+        self.started = False
+        self.complete = False
+        self.skipped = 0
+
+    def feed(self, text):
+        if self.complete:
+            return []
+        self.buffer += text
+        raw_items = []
+
+        while not self.complete:
+            pattern = self._in_string if self.in_string else self._interesting
+            match = pattern.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                break
+            char, self.pos = match.group(), match.end()
+
+            if self.in_string:
+                if char == '\\':
+                    if self.pos >= len(self.buffer):
+                        # Escape split across chunks: look at it again next time
+                        self.pos -= 1
+                        break
+                    self.pos += 1
+                else:
+                    self.in_string = False
+            elif not self.started:
+                # Skip any preamble (```json fences, prose) up to the array
+                self.started = char == '['
+            elif char == '"':
+                self.in_string = True
+            elif char in '[{':
+                if self.depth == 0:
+                    self.start = match.start()
+                self.depth += 1
+            elif self.depth == 0:
+                # The array's own closing bracket
+                self.complete = char == ']'
+            else:
+                self.depth -= 1
+                if self.depth == 0 and self.start is not None:
+                    raw_items.append(self.buffer[self.start:self.pos])
+                    self.start = None
+
+        # Drop everything already consumed
+        keep = self.start if self.start is not None else self.pos
+        self.buffer = self.buffer[keep:]
+        self.pos -= keep
+        if self.start is not None:
+            self.start = 0
+
+        tasks = []
+        for raw in raw_items:
+            try:
+                task = _clean_task(json.loads(raw))
+            except ValueError:
+                task = None
+            if task is None:
+                self.skipped += 1
+            else:
+                tasks.append(task)
+        return tasks
+
+
+def parse_tasks(text):
+    """Turn the model's JSON list into ``[{'title': ..., 'guide': ...}, ...]``."""
+    # Clean markdown backticks just in case the AI adds them
+    clean_text = text.strip().replace('```json', '').replace('```', '')
+    try:
+        items = json.loads(clean_text)
+    except ValueError as e:
+        raise GeminiError(f"Model returned invalid JSON: {e}") from e
+
+    if not isinstance(items, list):
+        raise GeminiError("Model did not return a JSON list.")
+    return [task for task in map(_clean_task, items) if task is not None]
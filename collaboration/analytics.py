@@ -0,0 +1,243 @@
+# collaboration/analytics.py
+# Incrementally maintained task analytics.
+#
+# Every status change is appended to TaskTransition (in the same transaction
+# as the change) and applied to two sets of counters as it happens: TaskStatusCount (current tasks per status) and
+# TaskRollup (tasks opened / completed per project, day and member). The
+# analytics page only reads those counters; rebuild_rollups() recomputes
+# them from the log if they ever drift.
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import Task, TaskRollup, TaskStatusCount, TaskTransition
+
+
+# --- 1. WRITING ---
+def _deltas(from_status, to_status):
+    """(opened, completed) change caused by one transition."""
+    opened = (1 if not from_status else 0) - (1 if not to_status else 0)
+    completed = (1 if to_status == 'DONE' else 0) - (1 if from_status == 'DONE' else 0)
+    return opened, completed
+
+
+def _bump(model, keys, **deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rows = model.objects.filter(**keys).order_by('id').values_list('id', flat=True)
+    row_id = rows.first()
+    if row_id is None:
+        # Two first bumps may race here: with a unique key one insert wins and
+        # the other is skipped (it waits for the winner), then both add to it
+        model.objects.bulk_create([model(**keys)], ignore_conflicts=True)
+        row_id = rows.first()
+    model.objects.filter(id=row_id).update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+
+def record_transitions(changes):
+    """Log many status changes at once and update the counters with them.
+
+    ``changes`` is an iterable of ``(task, from_status, to_status, member_id)``
+    using Task status strings ('' for created/deleted). The log rows go in
+    with one ``bulk_create`` and the counter deltas are summed per key first,
+    so inserting a batch of tasks costs a handful of queries, not a few per task.
+    Runs in the caller's transaction (or its own), so the log commits or
+    rolls back together with the task change that caused it.
+    """
+    now = timezone.now()
+    day = timezone.localdate(now)
+    codes = TaskTransition.STATUS_CODES
+
+    rows = []
+    status_deltas = defaultdict(int)
+    rollup_deltas = defaultdict(lambda: [0, 0])
+    for task, from_status, to_status, member_id in changes:
+        if from_status == to_status:
+            continue
+        rows.append(TaskTransition(
+            project_id=task.project_id,
+            task_id=task.pk,
+            from_status=codes[from_status],
+            to_status=codes[to_status],
+            member_id=member_id,
+            created_at=now,
+        ))
+        if from_status:
+            status_deltas[(task.project_id, from_status)] -= 1
+        if to_status:
+            status_deltas[(task.project_id, to_status)] += 1
+        opened, completed = _deltas(from_status, to_status)
+        rollup_deltas[(task.project_id, None)][0] += opened
+        rollup_deltas[(task.project_id, member_id)][1] += completed
+
+    if not rows:
+        return
+    with transaction.atomic():
+        TaskTransition.objects.bulk_create(rows, batch_size=1000)
+        for (project_id, status), delta in status_deltas.items():
+            _bump(TaskStatusCount, {'project_id': project_id, 'status': status}, total=delta)
+        for (project_id, member_id), (opened, completed) in rollup_deltas.items():
+            _bump(TaskRollup, {'project_id': project_id, 'day': day, 'member_id': member_id},
+                  opened=opened, completed=completed)
+
+
+def record_transition(task, from_status, to_status, member_id):
+    """Log a single status change of ``task``."""
+    record_transitions([(task, from_status, to_status, member_id)])
+
+
+# --- 2. REBUILDING ---
+def rebuild_rollups(project_ids=None):
+    """Recompute all counters from scratch. Returns the number of log rows read."""
+    tasks = Task.objects.all()
+    transitions = TaskTransition.objects.all()
+    rollups = TaskRollup.objects.all()
+    counts = TaskStatusCount.objects.all()
+    if project_ids is not None:
+        tasks = tasks.filter(project_id__in=project_ids)
+        transitions = transitions.filter(project_id__in=project_ids)
+        rollups = rollups.filter(project_id__in=project_ids)
+        counts = counts.filter(project_id__in=project_ids)
+
+    daily = defaultdict(lambda: [0, 0])
+    read = 0
+    rows = transitions.order_by('id').values_list('project_id', 'from_status', 'to_status', 'member_id', 'created_at')
+    statuses = TaskTransition.CODE_STATUSES
+    for project_id, from_code, to_code, member_id, created_at in rows.iterator(chunk_size=5000):
+        opened, completed = _deltas(statuses[from_code], statuses[to_code])
+        day = timezone.localdate(created_at)
+        daily[(project_id, day, None)][0] += opened
+        daily[(project_id, day, member_id)][1] += completed
+        read += 1
+
+    with transaction.atomic():
+        rollups.delete()
+        counts.delete()
+        TaskRollup.objects.bulk_create(
+            [
+                TaskRollup(project_id=project_id, day=day, member_id=member_id, opened=opened, completed=completed)
+                for (project_id, day, member_id), (opened, completed) in daily.items()
+                if opened or completed
+            ],
+            batch_size=1000,
+        )
+        # Current counts come from the tasks themselves, the authoritative source
+        TaskStatusCount.objects.bulk_create(
+            [
+                TaskStatusCount(project_id=row['project_id'], status=row['status'], total=row['total'])
+                for row in tasks.values('project_id', 'status').annotate(total=Count('id')).order_by()
+            ],
+            batch_size=1000,
+        )
+    return read
+
+
+# --- 3. READING ---
+def status_counts(project):
+    return list(
+        TaskStatusCount.objects.filter(project=project, total__gt=0)
+        .values('status', 'total')
+        .order_by('status')
+    )
+
+
+def contributions(project):
+    """Completed tasks per member, best first."""
+    return list(
+        TaskRollup.objects.filter(project=project)
+        .values('member__username')
+        .annotate(total=Sum('completed'))
+        .filter(total__gt=0)
+        .order_by('-total')
+    )
+
+
+def daily_completions(project, days=7):
+    """``[(day, completed), ...]`` for the last ``days`` days, oldest first."""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    done = dict(
+        TaskRollup.objects.filter(project=project, day__gte=start)
+        .values_list('day')
+        .annotate(total=Sum('completed'))
+        .order_by()
+    )
+    return [(start + timedelta(days=i), done.get(start + timedelta(days=i), 0)) for i in range(days)]
+
+
+def burndown(project):
+    """``[(day, open_tasks), ...]`` for every day with activity."""
+    remaining = 0
+    series = []
+    rows = (
+        TaskRollup.objects.filter(project=project)
+        .values_list('day')
+        .annotate(opened=Sum('opened'), completed=Sum('completed'))
+        .order_by('day')
+    )
+    for day, opened, completed in rows:
+        remaining += opened - completed
+        series.append((day, remaining))
+    return series
+
+
+def weekly_throughput(project):
+    """``[(week_start, completed), ...]`` oldest first."""
+    return list(
+        TaskRollup.objects.filter(project=project)
+        .annotate(week=TruncWeek('day'))
+        .values_list('week')
+        .annotate(total=Sum('completed'))
+        .order_by('week')
+    )
+
+
+def member_weekly_contributions(project):
+    """``{username: [(week_start, completed), ...]}`` for members with completions."""
+    series = defaultdict(list)
+    rows = (
+        TaskRollup.objects.filter(project=project, member__isnull=False)
+        .annotate(week=TruncWeek('day'))
+        .values_list('member__username', 'week')
+        .annotate(total=Sum('completed'))
+        .order_by('week')
+    )
+    for username, week, total in rows:
+        if total:
+            series[username].append((week, total))
+    return dict(series)
+
+
+# --- 4. EXPORT ---
+def iter_transitions(project, since=None, after_id=None, chunk_size=2000):
+    """Stream a project's transition log as plain dicts, in log (id) order.
+
+    Walks the (project, id) index chunk by chunk, so dashboards can consume
+    the full history without loading it into memory or touching the Task
+    table. Pass the last seen ``id`` as ``after_id`` to resume an
+    interrupted export; ids are the sort key too, so nothing is skipped or
+    repeated even where ``created_at`` is out of id order.
+    """
+    statuses = TaskTransition.CODE_STATUSES
+    rows = TaskTransition.objects.filter(project=project)
+    if since is not None:
+        rows = rows.filter(created_at__gte=since)
+    if after_id is not None:
+        rows = rows.filter(id__gt=after_id)
+    rows = rows.order_by('id').values_list(
+        'id', 'task_id', 'from_status', 'to_status', 'member_id', 'created_at'
+    )
+    for row_id, task_id, from_code, to_code, member_id, created_at in rows.iterator(chunk_size=chunk_size):
+        yield {
+            'id': row_id,
+            'task': task_id,
+            'from': statuses[from_code] or None,
+            'to': statuses[to_code] or None,
+            'member': member_id,
+            'at': created_at.isoformat(),
+        }
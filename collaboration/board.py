@@ -0,0 +1,65 @@
+# collaboration/board.py
+# Kanban board helpers shared by views and signals.
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from projects.models import Project
+from .models import Task
+
+# Completed tasks shown before "Show more"; each click adds another batch
+BOARD_DONE_LIMIT = getattr(settings, 'BOARD_DONE_LIMIT', 50)
+
+
+def bump_board_version(project_id):
+    """Mark the project's board as changed.
+
+    Called by the Task signals; call it directly after queryset ``update()``
+    or ``bulk_create()``, which skip signals.
+    """
+    Project.objects.filter(id=project_id).update(board_version=F('board_version') + 1)
+
+
+def board_etag(project, done_limit):
+    return f'"board-{project.id}-{project.board_version}-{done_limit}"'
+
+
+def bucket_tasks(project, done_limit=BOARD_DONE_LIMIT):
+    """Group a project's tasks into board columns in one pass.
+
+    Every TODO/IN_PROGRESS task is loaded, but only the ``done_limit``
+    most recently completed DONE ones, together with their assignee. Returns a context
+    dict with one list per column plus per-column ``counts``.
+    """
+    counts = {status: 0 for status, _ in Task.STATUS_CHOICES}
+    for row in Task.objects.filter(project=project).values('status').annotate(total=Count('id')):
+        counts[row['status']] = row['total']
+
+    recent_done = (
+        Task.objects.filter(project=project, status='DONE')
+        .order_by(F('completed_at').desc(nulls_last=True), '-id')
+        .values('id')[:done_limit]
+    )
+    tasks = (
+        Task.objects.filter(project=project)
+        .filter(~Q(status='DONE') | Q(id__in=recent_done))
+        .select_related('assigned_to')
+        .order_by('id')
+    )
+
+    columns = {status: [] for status in counts}
+    for task in tasks:
+        columns.setdefault(task.status, []).append(task)
+    # Latest completion first; tasks finished before completed_at existed go last
+    oldest = timezone.now().replace(year=1)
+    columns['DONE'].sort(key=lambda task: (task.completed_at or oldest, task.id), reverse=True)
+
+    return {
+        'todo_tasks': columns['TODO'],
+        'progress_tasks': columns['IN_PROGRESS'],
+        'done_tasks': columns['DONE'],
+        'counts': counts,
+        'done_limit': done_limit,
+        'hidden_done': max(counts['DONE'] - done_limit, 0),
+        'next_done_limit': done_limit + BOARD_DONE_LIMIT,
+    }
@@ -0,0 +1,169 @@
+# collaboration/jobs.py
+# DB-backed queue for AI task generation.
+#
+# The request only enqueues an AIGenerationJob; `manage.py run_ai_worker`
+# claims jobs, calls Gemini with a timeout and retries transient failures
+# with exponential backoff. Several workers may run at once: a job is
+# claimed with a conditional UPDATE, so exactly one of them gets it.
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from projects.realtime import publish
+from .ai import (
+    GeminiError, GeminiRejected, TaskStreamParser, build_prompt, forget_response, generate_content, parse_tasks,
+    stream_content,
+)
+from .analytics import record_transitions
+from .board import bump_board_version
+from .models import AIGenerationJob, Task
+
+AI_JOB_MAX_ATTEMPTS = getattr(settings, 'AI_JOB_MAX_ATTEMPTS', 3)
+# First retry waits this long, then 2x, 4x...
+AI_JOB_BACKOFF_SECONDS = getattr(settings, 'AI_JOB_BACKOFF_SECONDS', 10)
+# A RUNNING job locked longer than this belongs to a dead worker and is picked up again
+AI_JOB_LEASE_SECONDS = getattr(settings, 'AI_JOB_LEASE_SECONDS', 300)
+# Stream the answer and insert each task as soon as it is complete
+GEMINI_STREAM = getattr(settings, 'GEMINI_STREAM', True)
+
+
+# --- 1. ENQUEUE ---
+def enqueue_generation(project, user):
+    """Queue a generation for ``project``; an already active job is reused."""
+    job = project.ai_jobs.filter(status__in=AIGenerationJob.ACTIVE_STATUSES).order_by('-id').first()
+    if job is None:
+        job = AIGenerationJob.objects.create(
+            project=project, requested_by=user, max_attempts=AI_JOB_MAX_ATTEMPTS
+        )
+    return job
+
+
+# --- 2. CLAIM ---
+def claim_next_job(worker_id):
+    """Lock the next runnable job for ``worker_id``, or return None."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=AI_JOB_LEASE_SECONDS)
+    runnable = AIGenerationJob.objects.filter(
+        Q(status=AIGenerationJob.PENDING, run_after__lte=now)
+        | Q(status=AIGenerationJob.RUNNING, locked_at__lt=stale)
+    ).order_by('run_after', 'id')
+
+    for job_id, status, locked_at in runnable.values_list('id', 'status', 'locked_at')[:10]:
+        # Only succeeds if nobody claimed the row since we read it
+        claimed = AIGenerationJob.objects.filter(id=job_id, status=status, locked_at=locked_at).update(
+            status=AIGenerationJob.RUNNING,
+            locked_at=now,
+            locked_by=worker_id,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return AIGenerationJob.objects.select_related('project').get(id=job_id)
+    return None
+
+
+# --- 3. RUN ---
+def insert_generated_tasks(project, items):
+    """Insert generated tasks in one ``bulk_create`` and do what the Task signals would."""
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create(
+            [
+                Task(project=project, title=item['title'], description=item['guide'],
+                     status='TODO', assigned_to=None)
+                for item in items
+            ],
+            batch_size=500,
+        )
+        # bulk_create skips post_save: log the creations and bump the board ourselves
+        record_transitions([(task, '', 'TODO', None) for task in tasks])
+        bump_board_version(project.id)
+        publish(project.id, 'task', created=len(tasks))
+    return tasks
+
+
+def _finish(job, status, **fields):
+    job.status = status
+    job.locked_at = None
+    job.locked_by = ''
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.save()
+    publish(job.project_id, 'ai_job', id=job.id, status=job.status)
+
+
+def _progress(job, created_count):
+    job.created_count = created_count
+    AIGenerationJob.objects.filter(id=job.id).update(created_count=created_count, updated_at=timezone.now())
+    publish(job.project_id, 'ai_job', id=job.id, status=job.status, created=created_count)
+
+
+def _generate(job, project, prompt, timeout):
+    """Plain request: wait for the whole answer, insert everything at once."""
+    text = generate_content(project.gemini_api_key, prompt, timeout=timeout)
+    try:
+        items = parse_tasks(text)
+    except GeminiError:
+        forget_response(project.gemini_api_key, prompt)
+        raise
+    return len(insert_generated_tasks(project, items)), ''
+
+
+def _generate_streaming(job, project, prompt, timeout):
+    """Streamed request: every task goes on the board the moment it is parsed.
+
+    Once at least one task is in, a failure later in the stream (dropped
+    connection, malformed trailing output) ends the job with what it has
+    instead of retrying, which would duplicate those tasks.
+    """
+    parser = TaskStreamParser()
+    created = 0
+    note = ''
+    try:
+        for fragment in stream_content(project.gemini_api_key, prompt, timeout=timeout):
+            items = parser.feed(fragment)
+            if items:
+                created += len(insert_generated_tasks(project, items))
+                _progress(job, created)
+    except Exception as e:
+        if not created:
+            raise
+        note = f"Stopped early, kept {created} tasks: {e}"
+
+    if not parser.complete or parser.skipped or not created:
+        # Don't replay a broken answer from the cache
+        forget_response(project.gemini_api_key, prompt, stream=True)
+        if not note and created:
+            note = f"Output was cut short or partly malformed, kept {created} tasks."
+    if not created:
+        raise GeminiError("Model did not return any tasks.")
+    return created, note
+
+
+def run_job(job, timeout=None):
+    """Run one claimed job to DONE, FAILED or back to PENDING for a retry."""
+    project = job.project
+    try:
+        if job.attempts > job.max_attempts:
+            # Claimed again after its worker died on the last attempt
+            raise GeminiRejected("Gave up: the worker stopped during the last attempt.")
+        if not project.gemini_api_key:
+            raise GeminiRejected("Please add a Gemini API Key to your project settings.")
+
+        generate = _generate_streaming if GEMINI_STREAM else _generate
+        created, note = generate(job, project, build_prompt(project), timeout)
+    except Exception as e:
+        # Anything unexpected (network, DB) counts as transient; GeminiRejected does not
+        retryable = getattr(e, 'retryable', True)
+        if retryable and job.attempts < job.max_attempts:
+            delay = AI_JOB_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            _finish(job, AIGenerationJob.PENDING, error=str(e),
+                    run_after=timezone.now() + timedelta(seconds=delay))
+        else:
+            _finish(job, AIGenerationJob.FAILED, error=str(e))
+        return job
+
+    _finish(job, AIGenerationJob.DONE, error=note, created_count=created)
+    return job
@@ -0,0 +1,395 @@
+# collaboration/llm.py
+# Reusable HTTP client for LLM APIs, still standard library only.
+#
+#   - ConnectionPool: keep-alive connections reused across calls.
+#   - TokenBucket: per API key request rate limit.
+#   - A global semaphore capping concurrent requests per process.
+#   - ResponseCache: identical request bodies for the same API key within
+#     the TTL are answered from memory (LRU-evicted), without touching the network.
+# Counters (cache hits/misses, throttling, latency) come from ``stats()``.
+import hashlib
+import http.client
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+LLM_MAX_CONCURRENCY = getattr(settings, 'LLM_MAX_CONCURRENCY', 4)
+# Requests per minute allowed for one API key, and how many may burst at once
+LLM_RATE_PER_MINUTE = getattr(settings, 'LLM_RATE_PER_MINUTE', 15)
+LLM_RATE_BURST = getattr(settings, 'LLM_RATE_BURST', 5)
+LLM_CACHE_TTL = getattr(settings, 'LLM_CACHE_TTL', 3600)
+LLM_CACHE_SIZE = getattr(settings, 'LLM_CACHE_SIZE', 256)
+LLM_POOL_SIZE = getattr(settings, 'LLM_POOL_SIZE', 4)
+
+
+class ClientBusy(Exception):
+    """No rate-limit token or concurrency slot became free in time."""
+
+
+# --- 1. BUILDING BLOCKS ---
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port)."""
+
+    def __init__(self, max_idle=LLM_POOL_SIZE):
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, origin, timeout):
+        with self._lock:
+            idle = self._idle.get(origin)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self.connect(origin, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def connect(self, origin, timeout):
+        scheme, host, port = origin
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return conn_class(host, port, timeout=timeout)
+
+    def release(self, origin, conn):
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout):
+        """Take one token, waiting up to ``timeout`` seconds. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """Thread-safe LRU of ``key -> value`` with a per-entry TTL."""
+
+    def __init__(self, max_entries=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# --- 2. CLIENT ---
+class LLMClient:
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, rate_per_minute=LLM_RATE_PER_MINUTE,
+                 burst=LLM_RATE_BURST, cache=None, pool=None):
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.cache = cache if cache is not None else ResponseCache()
+        self.pool = pool if pool is not None else ConnectionPool()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            'requests': 0, 'cache_hits': 0, 'cache_misses': 0,
+            'errors': 0, 'throttled': 0, 'latency_total_ms': 0.0, 'latency_max_ms': 0.0,
+        }
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                self._counters[name] += delta
+
+    def _bucket(self, api_key):
+        # Keyed by a hash so raw keys never sit in memory longer than needed
+        digest = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+        with self._lock:
+            bucket = self._buckets.get(digest)
+            if bucket is None:
+                bucket = self._buckets[digest] = TokenBucket(self.rate_per_minute, self.burst)
+            return bucket
+
+    @staticmethod
+    def cache_key(url, payload, api_key=''):
+        # Per API key: a revoked or invalid key must not be answered from
+        # another key's cached response
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        key_digest = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+        return hashlib.sha256(f'{key_digest}\n{url}\n{body}'.encode('utf-8')).hexdigest()
+
+    def forget(self, url, payload, api_key=''):
+        """Drop a cached answer, e.g. one the caller could not use."""
+        self.cache.discard(self.cache_key(url, payload, api_key))
+
+    def post_json(self, url, payload, api_key='', headers=None, timeout=30, use_cache=True):
+        """POST ``payload`` as JSON and return ``(status, body_bytes)``.
+
+        Only 200 answers are cached. Raises ClientBusy when throttled for
+        longer than ``timeout``, and OSError/HTTPException on network failure.
+        """
+        key = self.cache_key(url, payload, api_key) if use_cache else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count(cache_hits=1)
+                return 200, cached
+            self._count(cache_misses=1)
+
+        if api_key and not self._bucket(api_key).acquire(timeout):
+            self._count(throttled=1)
+            raise ClientBusy("Rate limit for this API key reached.")
+        if not self._slots.acquire(timeout=timeout):
+            self._count(throttled=1)
+            raise ClientBusy("Too many AI requests in flight.")
+
+        started = time.monotonic()
+        try:
+            status, body = self._send(url, payload, headers or {}, timeout)
+        except Exception:
+            self._count(errors=1)
+            raise
+        finally:
+            self._slots.release()
+            self._timed(started)
+
+        if status != 200:
+            self._count(errors=1)
+        elif key is not None:
+            self.cache.set(key, body)
+        return status, body
+
+    def post_json_lines(self, url, payload, api_key='', headers=None, timeout=30, use_cache=True):
+        """Like ``post_json`` but return ``(status, lines)`` while the body is still arriving.
+
+        ``lines`` yields the response line by line as the server sends it
+        (for streaming / server-sent event endpoints). A fully read 200
+        response is cached and replayed line by line on the next hit.
+        """
+        key = self.cache_key(url, payload, api_key) if use_cache else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count(cache_hits=1)
+                return 200, iter(cached.splitlines(keepends=True))
+            self._count(cache_misses=1)
+
+        if api_key and not self._bucket(api_key).acquire(timeout):
+            self._count(throttled=1)
+            raise ClientBusy("Rate limit for this API key reached.")
+        if not self._slots.acquire(timeout=timeout):
+            self._count(throttled=1)
+            raise ClientBusy("Too many AI requests in flight.")
+
+        started = time.monotonic()
+        try:
+            origin, conn, response = self._open(url, payload, headers or {}, timeout)
+        except Exception:
+            self._slots.release()
+            self._timed(started)
+            self._count(errors=1)
+            raise
+        if response.status != 200:
+            self._count(errors=1)
+            key = None
+        return response.status, _LineStream(self, origin, conn, response, key, started)
+
+    def _timed(self, started):
+        elapsed = (time.monotonic() - started) * 1000
+        with self._lock:
+            self._counters['requests'] += 1
+            self._counters['latency_total_ms'] += elapsed
+            self._counters['latency_max_ms'] = max(self._counters['latency_max_ms'], elapsed)
+
+    def _open(self, url, payload, headers, timeout):
+        """Send the request and return ``(origin, conn, response)`` with the body unread."""
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json', **headers}
+
+        conn, reused = self.pool.acquire(origin, timeout)
+        try:
+            return origin, conn, self._request(conn, path, body, headers)
+        except (http.client.RemoteDisconnected, http.client.ResponseNotReady, http.client.CannotSendRequest,
+                BrokenPipeError, ConnectionResetError):
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; one fresh try
+            conn = self.pool.connect(origin, timeout)
+            return origin, conn, self._request(conn, path, body, headers)
+
+    def _request(self, conn, path, body, headers):
+        try:
+            conn.request('POST', path, body=body, headers=headers)
+            return conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+
+    def _send(self, url, payload, headers, timeout):
+        origin, conn, response = self._open(url, payload, headers, timeout)
+        try:
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+        self._done(origin, conn, response)
+        return response.status, data
+
+    def _done(self, origin, conn, response):
+        # Only a fully read response leaves the connection ready for the next request
+        if response.isclosed() and not response.will_close:
+            self.pool.release(origin, conn)
+        else:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['cache_hits'] + counters['cache_misses']
+        counters['cache_hit_rate'] = round(counters['cache_hits'] / lookups, 3) if lookups else 0.0
+        counters['latency_avg_ms'] = (
+            round(counters['latency_total_ms'] / counters['requests'], 1) if counters['requests'] else 0.0
+        )
+        counters['latency_total_ms'] = round(counters['latency_total_ms'], 1)
+        counters['latency_max_ms'] = round(counters['latency_max_ms'], 1)
+        counters['cache_entries'] = len(self.cache)
+        return counters
+
+
+class _LineStream:
+    """The lines of a streamed response, as ``post_json_lines`` returns them.
+
+    Holds a concurrency slot and a connection until the body is read to the
+    end, ``close()`` is called, or the stream is garbage collected, even if
+    it is never iterated at all.
+    """
+
+    def __init__(self, client, origin, conn, response, key, started):
+        self.client = client
+        self.origin = origin
+        self.conn = conn
+        self.response = response
+        self.key = key
+        self.started = started
+        self.received = []
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise StopIteration
+        try:
+            line = self.response.readline()
+        except Exception:
+            self.client._count(errors=1)
+            self._finish(complete=False)
+            raise
+        if not line:
+            self._finish(complete=True)
+            raise StopIteration
+        if self.key is not None:
+            self.received.append(line)
+        return line
+
+    def close(self):
+        # Abandoned mid-body: the connection can't be reused
+        self._finish(complete=False)
+
+    __del__ = close
+
+    def _finish(self, complete):
+        if self.closed:
+            return
+        self.closed = True
+        self.client._slots.release()
+        self.client._timed(self.started)
+        if not complete:
+            self.conn.close()
+            return
+        try:
+            # readline() stops at Content-Length without closing the response;
+            # reading the (empty) rest marks it done so the connection can be pooled
+            self.response.read()
+        except Exception:
+            self.conn.close()
+            return
+        self.client._done(self.origin, self.conn, self.response)
+        if self.key is not None:
+            self.client.cache.set(self.key, b''.join(self.received))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, so the pool, limits and cache are shared."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
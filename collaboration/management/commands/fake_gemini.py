@@ -0,0 +1,88 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+FAKE_TASKS = [
+    {"title": "Setup Git", "guide": "Initialize a repository and push the first commit so everyone works from one history."},
+    {"title": "Base Layout", "guide": "Create the base.html template that every page extends, so styling lives in one place."},
+    {"title": "Data Models", "guide": "Sketch the core models and run the first migration to agree on the schema early."},
+    {"title": "Auth Flow", "guide": "Wire up register, login and logout so the rest of the features can rely on a user."},
+    {"title": "Deploy Preview", "guide": "Deploy a preview build to catch environment issues before the final week."},
+]
+
+
+class Command(BaseCommand):
+    help = "Serve a local stand-in for the Gemini generateContent endpoint (offline testing)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--delay', type=float, default=0.0,
+                            help="Seconds to wait before answering (to exercise timeouts).")
+        parser.add_argument('--fail', type=int, default=0,
+                            help="Answer the first N requests with HTTP 503 (to exercise retries).")
+        parser.add_argument('--chunk-delay', type=float, default=0.2,
+                            help="Seconds between streamed chunks.")
+        parser.add_argument('--malformed', action='store_true',
+                            help="Cut the streamed answer off inside the last task, followed by junk.")
+
+    def handle(self, *args, **options):
+        state = {'failures_left': options['fail']}
+        delay = options['delay']
+        chunk_delay = options['chunk_delay']
+        malformed = options['malformed']
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like the real API, so the client's connection pool is exercised
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                time.sleep(delay)
+                if state['failures_left'] > 0:
+                    state['failures_left'] -= 1
+                    return self._send(503, {"error": {"code": 503, "message": "The model is overloaded."}})
+                text = json.dumps(FAKE_TASKS, indent=2)
+                if ':streamGenerateContent' in self.path:
+                    return self._stream(text)
+                if ':generateContent' not in self.path:
+                    return self._send(404, {"error": {"code": 404, "message": "Unknown method."}})
+                self._send(200, {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+            def _stream(self, text):
+                if malformed:
+                    text = text[:text.rindex('"guide"') + 20] + '\n```\nHope this helps!'
+                # Server-sent events, a few dozen characters per chunk, sent chunked
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for i in range(0, len(text), 40):
+                    chunk = {"candidates": [{"content": {"parts": [{"text": text[i:i + 40]}]}}]}
+                    event = f"data: {json.dumps(chunk)}\r\n\r\n".encode('utf-8')
+                    self.wfile.write(f"{len(event):x}\r\n".encode('ascii') + event + b"\r\n")
+                    self.wfile.flush()
+                    time.sleep(chunk_delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _send(self, code, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), Handler)
+        url = f"http://127.0.0.1:{options['port']}/v1beta/models/fake"
+        self.stdout.write(f"Fake Gemini listening. Run the worker with GEMINI_API_URL={url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from collaboration.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute task analytics counters from the TaskTransition log."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help="Only rebuild this project id (repeatable).")
+
+    def handle(self, *args, **options):
+        read = rebuild_rollups(options['projects'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups from {read} transitions."))
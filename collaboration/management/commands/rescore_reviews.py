@@ -0,0 +1,58 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from collaboration.models import PeerReview
+from collaboration.moderation import apply_scores, feedback_hash, remember_scores, score_texts
+
+
+class Command(BaseCommand):
+    help = "Re-score every peer review, in parallel chunks on a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        # Child processes only compute scores; all DB work stays here
+        connections.close_all()
+
+        total = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            pending = []
+            for chunk in self._chunks(chunk_size):
+                # Identical feedback in a chunk is scored once
+                texts_by_hash = {review.feedback_hash: review.feedback for review in chunk}
+                future = pool.submit(score_texts, list(texts_by_hash.values()))
+                pending.append((chunk, list(texts_by_hash), future))
+                # Keep a couple of chunks per worker in flight, not the whole table in memory
+                if len(pending) >= options['workers'] * 2:
+                    total += self._save(*pending.pop(0))
+            for job in pending:
+                total += self._save(*job)
+
+        self.stdout.write(self.style.SUCCESS(f"Re-scored {total} reviews."))
+
+    def _chunks(self, chunk_size):
+        last_id = 0
+        while True:
+            chunk = list(
+                PeerReview.objects.filter(id__gt=last_id).order_by('id')
+                .only('id', 'feedback', 'feedback_hash')[:chunk_size]
+            )
+            if not chunk:
+                return
+            last_id = chunk[-1].id
+            for review in chunk:
+                review.feedback_hash = feedback_hash(review.feedback)
+            yield chunk
+
+    def _save(self, chunk, hashes, future):
+        scores = dict(zip(hashes, future.result()))
+        # Fresh scores replace cached ones (the analyzer or threshold may have changed)
+        remember_scores(scores)
+        apply_scores(chunk, scores)
+        return len(chunk)
@@ -0,0 +1,52 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from collaboration.jobs import claim_next_job, run_job
+from collaboration.llm import get_client
+
+
+class Command(BaseCommand):
+    help = "Process queued AI task generation jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once no job is ready instead of waiting for more.")
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help="Seconds to wait between polls of an empty queue.")
+        parser.add_argument('--timeout', type=float, default=None,
+                            help="Gemini request timeout in seconds (default: settings.GEMINI_TIMEOUT).")
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"AI worker {worker_id} started.")
+        try:
+            while True:
+                close_old_connections()
+                job = claim_next_job(worker_id)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+
+                run_job(job, timeout=options['timeout'])
+                style = self.style.SUCCESS if job.status == job.DONE else self.style.WARNING
+                detail = f"{job.created_count} tasks" if job.status == job.DONE else job.error[:200]
+                self.stdout.write(style(f"Job {job.id} (attempt {job.attempts}): {job.status} - {detail}"))
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"  {self._format_stats()}")
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"AI worker stopped. Client stats: {self._format_stats()}")
+
+    def _format_stats(self):
+        stats = get_client().stats()
+        return (
+            f"{stats['requests']} requests, {stats['cache_hits']} cache hits / {stats['cache_misses']} misses, "
+            f"{stats['throttled']} throttled, {stats['errors']} errors, "
+            f"latency avg {stats['latency_avg_ms']} ms / max {stats['latency_max_ms']} ms"
+        )
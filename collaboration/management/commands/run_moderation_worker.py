@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from collaboration.moderation import MODERATION_BATCH_SIZE, moderate_pending
+
+
+class Command(BaseCommand):
+    help = "Score new peer reviews for toxicity in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once nothing is pending instead of waiting for more.")
+        parser.add_argument('--batch-size', type=int, default=MODERATION_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=5.0,
+                            help="Seconds to wait between polls when nothing is pending.")
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                close_old_connections()
+                scored = moderate_pending(options['batch_size'])
+                total += scored
+                if scored:
+                    self.stdout.write(f"Scored {scored} reviews.")
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Moderation worker stopped after {total} reviews."))
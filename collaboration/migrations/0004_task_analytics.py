@@ -0,0 +1,91 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_transitions(apps, schema_editor):
+    # Existing tasks have no history: log each one as created in its current
+    # status today, and build the counters from that.
+    Task = apps.get_model('collaboration', 'Task')
+    TaskTransition = apps.get_model('collaboration', 'TaskTransition')
+    TaskRollup = apps.get_model('collaboration', 'TaskRollup')
+    TaskStatusCount = apps.get_model('collaboration', 'TaskStatusCount')
+
+    now = django.utils.timezone.now()
+    today = django.utils.timezone.localdate(now)
+    transitions, counts, opened, completed = [], {}, {}, {}
+    for task_id, project_id, status, member_id in Task.objects.values_list(
+        'id', 'project_id', 'status', 'assigned_to_id'
+    ).iterator():
+        transitions.append(TaskTransition(
+            project_id=project_id, task_id=task_id, from_status='', to_status=status,
+            member_id=member_id if status == 'DONE' else None, created_at=now,
+        ))
+        counts[(project_id, status)] = counts.get((project_id, status), 0) + 1
+        opened[project_id] = opened.get(project_id, 0) + 1
+        if status == 'DONE':
+            completed[(project_id, member_id)] = completed.get((project_id, member_id), 0) + 1
+
+    TaskTransition.objects.bulk_create(transitions, batch_size=1000)
+    TaskStatusCount.objects.bulk_create(
+        [TaskStatusCount(project_id=p, status=s, total=n) for (p, s), n in counts.items()], batch_size=1000
+    )
+    TaskRollup.objects.bulk_create(
+        [TaskRollup(project_id=p, day=today, member_id=None, opened=n) for p, n in opened.items()]
+        + [TaskRollup(project_id=p, day=today, member_id=m, completed=n) for (p, m), n in completed.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collaboration', '0003_task_description'),
+        ('projects', '0012_project_board_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, max_length=20)),
+                ('to_status', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_transitions', to='projects.project')),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transitions', to='collaboration.task')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('opened', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_rollups', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'day'], name='collaborati_project_e331d8_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('DONE', 'Done')], max_length=20)),
+                ('total', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_status_counts', to='projects.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'status'), name='unique_project_status_count')],
+            },
+        ),
+        migrations.RunPython(seed_transitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+STATUS_CODES = {'': 0, 'TODO': 1, 'IN_PROGRESS': 2, 'DONE': 3}
+CODE_CHOICES = [(0, 'None'), (1, 'To Do'), (2, 'In Progress'), (3, 'Done')]
+
+
+def encode_statuses(apps, schema_editor):
+    TaskTransition = apps.get_model('collaboration', 'TaskTransition')
+    for old, code in STATUS_CODES.items():
+        TaskTransition.objects.filter(from_status=old).update(from_code=code)
+        TaskTransition.objects.filter(to_status=old).update(to_code=code)
+
+
+def decode_statuses(apps, schema_editor):
+    TaskTransition = apps.get_model('collaboration', 'TaskTransition')
+    for old, code in STATUS_CODES.items():
+        TaskTransition.objects.filter(from_code=code).update(from_status=old)
+        TaskTransition.objects.filter(to_code=code).update(to_status=old)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collaboration', '0004_task_analytics'),
+        ('projects', '0012_project_board_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasktransition',
+            name='from_code',
+            field=models.PositiveSmallIntegerField(choices=CODE_CHOICES, default=0),
+        ),
+        migrations.AddField(
+            model_name='tasktransition',
+            name='to_code',
+            field=models.PositiveSmallIntegerField(choices=CODE_CHOICES, default=0),
+        ),
+        migrations.RunPython(encode_statuses, decode_statuses),
+        migrations.RemoveField(
+            model_name='tasktransition',
+            name='from_status',
+        ),
+        migrations.RemoveField(
+            model_name='tasktransition',
+            name='to_status',
+        ),
+        migrations.RenameField(
+            model_name='tasktransition',
+            old_name='from_code',
+            new_name='from_status',
+        ),
+        migrations.RenameField(
+            model_name='tasktransition',
+            old_name='to_code',
+            new_name='to_status',
+        ),
+        migrations.AlterField(
+            model_name='tasktransition',
+            name='task',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='transitions', to='collaboration.task'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktransition',
+            index=models.Index(fields=['project', 'created_at'], name='collaborati_project_55f124_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collaboration', '0006_ai_generation_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='peerreview',
+            name='feedback_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='peerreview',
+            name='flagged',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='peerreview',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='peerreview',
+            name='sentiment',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='peerreview',
+            index=models.Index(fields=['moderated_at', 'id'], name='peerreview_moderation_idx'),
+        ),
+    ]
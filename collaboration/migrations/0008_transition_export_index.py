@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collaboration', '0007_peerreview_moderation'),
+        ('projects', '0021_team_recommendation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tasktransition',
+            index=models.Index(fields=['project', 'id'], name='tasktransition_export_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:27
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_completed_at(apps, schema_editor):
+    # Last move into DONE according to the transition log (3 = DONE)
+    Task = apps.get_model('collaboration', 'Task')
+    TaskTransition = apps.get_model('collaboration', 'TaskTransition')
+    last_done = (
+        TaskTransition.objects.filter(task_id=OuterRef('pk'), to_status=3)
+        .values('task_id').annotate(at=Max('created_at')).values('at')
+    )
+    Task.objects.filter(status='DONE').update(completed_at=Subquery(last_done))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collaboration', '0008_transition_export_index'),
+        ('projects', '0021_team_recommendation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'completed_at'], name='task_done_order_idx'),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -23,6 +24,32 @@ class Task(models.Model):
     # NEW: Stores the AI-generated mentor guide/purpose for the task
     description = models.TextField(blank=True, null=True)
 
+    # When the task last moved into DONE; orders the capped Completed column
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'completed_at'], name='task_done_order_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded state so a save can log the status transition
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_assigned_to_id = instance.__dict__.get('assigned_to_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.status != 'DONE':
+            self.completed_at = None
+        elif self.completed_at is None or getattr(self, '_loaded_status', None) != 'DONE':
+            self.completed_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'completed_at'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
@@ -40,5 +67,127 @@ class PeerReview(models.Model):
     rating = models.IntegerField(choices=[(i, i) for i in range(1, 6)]) # 1-5 Scale
     feedback = models.TextField()
 
+    # Filled in by the moderation worker (moderation.py), never in the request
+    feedback_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    sentiment = models.FloatField(null=True, blank=True)
+    flagged = models.BooleanField(default=False)
+    moderated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['moderated_at', 'id'], name='peerreview_moderation_idx'),
+        ]
+
+    def __str__(self):
+        return f"Review for {self.reviewee.username} by {self.reviewer.username}"
+
+
+# --- ANALYTICS: transition log + precomputed rollups ---
+class TaskTransition(models.Model):
+    # Append-only log of task status changes. The rollups below are derived
+    # from it and can always be rebuilt from it (rebuild_task_rollups).
+    # Rows are never updated: statuses are stored as small integer codes and
+    # the task reference has no DB constraint, so deleting a task leaves its
+    # history untouched.
+    NO_STATUS = 0
+    STATUS_CODES = {'': NO_STATUS, 'TODO': 1, 'IN_PROGRESS': 2, 'DONE': 3}
+    CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+    CODE_CHOICES = [(NO_STATUS, 'None'), (1, 'To Do'), (2, 'In Progress'), (3, 'Done')]
+
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='task_transitions')
+    task = models.ForeignKey(
+        Task, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='transitions'
+    )
+    # NO_STATUS as from_status means "created", as to_status means "deleted"
+    from_status = models.PositiveSmallIntegerField(choices=CODE_CHOICES, default=NO_STATUS)
+    to_status = models.PositiveSmallIntegerField(choices=CODE_CHOICES, default=NO_STATUS)
+    # The user the change counts for (the completer for moves in/out of DONE)
+    member = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'created_at']),
+            # Export order and resume cursor (analytics.iter_transitions)
+            models.Index(fields=['project', 'id'], name='tasktransition_export_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id}: {self.get_from_status_display()} -> {self.get_to_status_display()}"
+
+
+class TaskRollup(models.Model):
+    # Per project, per day, per member counters. Rows are only ever summed,
+    # so an occasional duplicate (project, day, member) row is harmless.
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='task_rollups')
+    day = models.DateField()
+    member = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
+    opened = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.day}: +{self.opened} / {self.completed} done"
+
+
+class TaskStatusCount(models.Model):
+    # Current number of tasks per status for each project
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='task_status_counts')
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'status'], name='unique_project_status_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.status}: {self.total}"
+
+
+# --- AI GENERATION QUEUE ---
+class AIGenerationJob(models.Model):
+    # One "generate tasks with AI" request. Rows are claimed and run by the
+    # run_ai_worker command; the board polls the row for progress.
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (PENDING, RUNNING)
+
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='ai_jobs')
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    # Not picked up before this time (retry backoff)
+    run_after = models.DateTimeField(default=timezone.now)
+    # Set while a worker holds the job; a stale lock means the worker died
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    created_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
     def __str__(self):
-        return f"Review for {self.reviewee.username} by {self.reviewer.username}"
\ No newline at end of file
+        return f"AI job {self.id} for {self.project_id}: {self.status}"
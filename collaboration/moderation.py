@@ -0,0 +1,94 @@
+# collaboration/moderation.py
+# Peer review sentiment moderation, run off the request path.
+#
+# submit_review only stores the review with a hash of its text. The
+# moderation worker (manage.py run_moderation_worker) scores pending
+# reviews in batches with one TextBlob analyzer per process; scores are
+# cached by text hash, so repeated feedback ("Great teammate!") is scored
+# once. manage.py rescore_reviews re-scores the whole backlog with a
+# process pool.
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from config.startup import lazy_import
+from .models import PeerReview
+
+# textblob pulls in nltk; only the moderation worker should ever pay for that
+sentiments = lazy_import('textblob.sentiments')
+
+# Polarity below this (-1.0 .. 1.0) flags the review as toxic
+MODERATION_THRESHOLD = getattr(settings, 'MODERATION_THRESHOLD', -0.5)
+MODERATION_BATCH_SIZE = getattr(settings, 'MODERATION_BATCH_SIZE', 200)
+MODERATION_CACHE_TIMEOUT = getattr(settings, 'MODERATION_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+_analyzer = None
+
+
+def feedback_hash(text):
+    return hashlib.sha256((text or '').strip().encode('utf-8')).hexdigest()
+
+
+def _cache_key(digest):
+    return f'moderation:{digest}'
+
+
+# --- 1. SCORING ---
+def score_texts(texts):
+    """Polarity of each text, in order. Loads the analyzer once per process."""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = sentiments.PatternAnalyzer()
+    return [_analyzer.analyze(text or '').polarity for text in texts]
+
+
+def score_by_hash(texts_by_hash):
+    """``{hash: text}`` -> ``{hash: polarity}``, using the cache where possible."""
+    keys = {_cache_key(digest): digest for digest in texts_by_hash}
+    scores = {keys[key]: score for key, score in cache.get_many(list(keys)).items()}
+
+    missing = [digest for digest in texts_by_hash if digest not in scores]
+    if missing:
+        fresh = dict(zip(missing, score_texts([texts_by_hash[digest] for digest in missing])))
+        remember_scores(fresh)
+        scores.update(fresh)
+    return scores
+
+
+def remember_scores(scores):
+    cache.set_many({_cache_key(digest): score for digest, score in scores.items()}, MODERATION_CACHE_TIMEOUT)
+
+
+def apply_scores(reviews, scores):
+    """Write ``{hash: polarity}`` onto the reviews with one bulk UPDATE."""
+    now = timezone.now()
+    for review in reviews:
+        review.sentiment = scores[review.feedback_hash]
+        review.flagged = review.sentiment < MODERATION_THRESHOLD
+        review.moderated_at = now
+    PeerReview.objects.bulk_update(
+        reviews, ['feedback_hash', 'sentiment', 'flagged', 'moderated_at'], batch_size=500
+    )
+
+
+# --- 2. BATCHES ---
+def moderate_pending(batch_size=MODERATION_BATCH_SIZE):
+    """Score one batch of unmoderated reviews. Returns how many were scored."""
+    reviews = list(
+        PeerReview.objects.filter(moderated_at__isnull=True)
+        .order_by('id')
+        .only('id', 'feedback', 'feedback_hash')[:batch_size]
+    )
+    if not reviews:
+        return 0
+
+    texts_by_hash = {}
+    for review in reviews:
+        if not review.feedback_hash:
+            review.feedback_hash = feedback_hash(review.feedback)
+        texts_by_hash.setdefault(review.feedback_hash, review.feedback)
+
+    apply_scores(reviews, score_by_hash(texts_by_hash))
+    return len(reviews)
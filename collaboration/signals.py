@@ -0,0 +1,39 @@
+# collaboration/signals.py
+# Task change hooks: board version bumps and the analytics transition log.
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from projects.models import Project
+from .analytics import record_transition
+from .board import bump_board_version
+from .models import Task
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Project):
+        return
+    bump_board_version(instance.project_id)
+
+
+@receiver(post_save, sender=Task)
+def log_task_saved(sender, instance, created, **kwargs):
+    old_status = '' if created else getattr(instance, '_loaded_status', instance.status)
+    old_member = None if created else getattr(instance, '_loaded_assigned_to_id', instance.assigned_to_id)
+
+    if old_status != instance.status:
+        # Moves out of DONE are credited back to whoever had completed the task
+        member = old_member if old_status == 'DONE' else instance.assigned_to_id
+        record_transition(instance, old_status, instance.status, member)
+
+    instance._loaded_status = instance.status
+    instance._loaded_assigned_to_id = instance.assigned_to_id
+
+
+@receiver(post_delete, sender=Task)
+def log_task_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting the whole project cascades away its log and rollups as well
+    if isinstance(origin, Project):
+        return
+    record_transition(instance, instance.status, '', instance.assigned_to_id)
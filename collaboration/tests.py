@@ -1,3 +1,65 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .ai import TaskStreamParser
+
+
+# --- 1. STREAMED TASK PARSING ---
+class TaskStreamParserTests(SimpleTestCase):
+    answer = (
+        '```json\n[{"title": "Set up repo", "guide": "git init"},'
+        ' {"title": "Write \\"docs\\" {later}", "guide": "a [b] c"},'
+        ' {"title": "Deploy", "guide": ""}]\n```'
+    )
+
+    def feed_all(self, parser, text, step):
+        tasks = []
+        for start in range(0, len(text), step):
+            tasks.extend(parser.feed(text[start:start + step]))
+        return tasks
+
+    def test_same_tasks_however_the_text_is_split(self):
+        for step in (1, 2, 3, 7, len(self.answer)):
+            parser = TaskStreamParser()
+            tasks = self.feed_all(parser, self.answer, step)
+            self.assertEqual([task['title'] for task in tasks], ['Set up repo', 'Write "docs" {later}', 'Deploy'])
+            self.assertEqual(tasks[1]['guide'], 'a [b] c')
+            self.assertTrue(parser.complete)
+            self.assertEqual(parser.skipped, 0)
+
+    def test_tasks_are_returned_as_soon_as_they_close(self):
+        parser = TaskStreamParser()
+        self.assertEqual(parser.feed('[{"title": "One"'), [])
+        self.assertEqual(parser.feed('}, {"title": '), [{'title': 'One', 'guide': ''}])
+        self.assertEqual(parser.feed('"Two"}]'), [{'title': 'Two', 'guide': ''}])
+
+    def test_truncated_stream_keeps_finished_tasks(self):
+        parser = TaskStreamParser()
+        tasks = parser.feed('[{"title": "Kept"}, {"title": "Cut of')
+        self.assertEqual(tasks, [{'title': 'Kept', 'guide': ''}])
+        self.assertFalse(parser.complete)
+        # Only the unfinished object is held on to
+        self.assertEqual(parser.buffer, '{"title": "Cut of')
+
+    def test_escape_split_across_chunks(self):
+        parser = TaskStreamParser()
+        tasks = parser.feed('[{"title": "a\\') + parser.feed('"}"}]')
+        self.assertEqual(tasks, [{'title': 'a"}', 'guide': ''}])
+        self.assertTrue(parser.complete)
+
+    def test_malformed_objects_are_skipped(self):
+        parser = TaskStreamParser()
+        tasks = parser.feed('[{"title": "Good"}, {"title": oops}, {"guide": "no title"}, {"title": "Also good"}]')
+        self.assertEqual([task['title'] for task in tasks], ['Good', 'Also good'])
+        self.assertEqual(parser.skipped, 2)
+        self.assertTrue(parser.complete)
+
+    def test_text_after_the_array_is_ignored(self):
+        parser = TaskStreamParser()
+        tasks = parser.feed('[{"title": "Only"}] and {"title": "not this"}')
+        self.assertEqual(tasks, [{'title': 'Only', 'guide': ''}])
+        self.assertEqual(parser.feed('{"title": "nor this"}'), [])
+
+    def test_no_array_at_all(self):
+        parser = TaskStreamParser()
+        self.assertEqual(parser.feed('Sorry, I cannot help with that.'), [])
+        self.assertFalse(parser.complete)
@@ -1,26 +1,61 @@
 import json
-import urllib.request
-import urllib.error
 # NOTICE: We completely removed the Google imports to bypass the SDK bugs.
+# Gemini is called over plain REST from the background worker (ai.py / jobs.py).
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import (
+    HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseNotModified, JsonResponse,
+    StreamingHttpResponse,
+)
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
 from django.contrib import messages
-from django.db.models import Count
 from projects.models import Project
-from .models import Task, PeerReview
-from textblob import TextBlob 
+from projects.realtime import publish
+from .models import AIGenerationJob, Task, PeerReview
+from .analytics import contributions, daily_completions, iter_transitions, status_counts
+from .board import BOARD_DONE_LIMIT, board_etag, bucket_tasks
+from .jobs import enqueue_generation
+from .moderation import feedback_hash
 
 # --- 1. BOARD LOGIC ---
 def board_view(request, project_id):
     project = get_object_or_404(Project, id=project_id)
-    tasks = Task.objects.filter(project=project)
-    
+
+    done_limit = request.GET.get('done_limit', '')
+    done_limit = max(int(done_limit), BOARD_DONE_LIMIT) if done_limit.isdigit() else BOARD_DONE_LIMIT
+
     if request.headers.get('HX-Request'):
-        pass 
-    
-    return render(request, 'board.html', {'project': project, 'tasks': tasks})
+        # Polls send the version they already show; nothing changed -> no body
+        if request.GET.get('version') == str(project.board_version):
+            return HttpResponse(status=204)
+        etag = board_etag(project, done_limit)
+        if etag in request.headers.get('If-None-Match', ''):
+            return HttpResponseNotModified()
+
+    context = {
+        'project': project,
+        'realtime': settings.REALTIME_ENABLED,
+        **bucket_tasks(project, done_limit),
+    }
+
+    if request.headers.get('HX-Request'):
+        # Only the board itself; the page shell, styles and canvas script stay put
+        response = render(request, 'board_partial.html', context)
+        response['ETag'] = etag
+        return response
+
+    if request.user == project.owner:
+        # A generation still in the queue shows its progress above the board
+        context['ai_job'] = project.ai_jobs.filter(
+            status__in=AIGenerationJob.ACTIVE_STATUSES
+        ).order_by('-id').first()
+
+    return render(request, 'board.html', context)
 
+@transaction.atomic
 def add_task(request, project_id):
     project = get_object_or_404(Project, id=project_id)
     
@@ -30,16 +65,21 @@ def add_task(request, project_id):
 
     if request.method == "POST":
         title = request.POST.get('title')
-        Task.objects.create(
+        task = Task.objects.create(
             title=title, 
             project=project, 
             status='TODO',
             assigned_to=None 
         )
+        publish(project.id, 'task', id=task.id, status=task.status)
     return redirect('board_view', project_id=project_id)
 
+@transaction.atomic
 def update_task(request, task_id, new_status):
+    # Atomic so the TaskTransition row and counters commit with the status change
     task = get_object_or_404(Task, id=task_id)
+    if new_status not in dict(Task.STATUS_CHOICES):
+        return HttpResponseBadRequest("Unknown status.")
     task.status = new_status
     
     if new_status == 'DONE':
@@ -48,6 +88,7 @@ def update_task(request, task_id, new_status):
         task.assigned_to = None
         
     task.save()
+    publish(task.project_id, 'task', id=task.id, status=task.status)
     
     response = HttpResponse("")
     response['HX-Trigger'] = 'refreshBoard' 
@@ -56,23 +97,47 @@ def update_task(request, task_id, new_status):
 # --- 2. ANALYTICS LOGIC ---
 def project_analytics(request, project_id):
     project = get_object_or_404(Project, id=project_id)
-    
-    status_data = Task.objects.filter(project=project)\
-        .values('status')\
-        .annotate(total=Count('id'))
-        
-    contribution_data = Task.objects.filter(project=project, status='DONE')\
-        .values('assigned_to__username')\
-        .annotate(total=Count('id'))\
-        .order_by('-total')
+
+    # Everything here reads the precomputed counters maintained from the
+    # TaskTransition log; no aggregate runs over the Task table.
+    velocity = daily_completions(project, days=7)
+    peak = max((total for _, total in velocity), default=0) or 1
 
     context = {
         'project': project,
-        'status_data': list(status_data),
-        'contribution_data': list(contribution_data)
+        'status_data': status_counts(project),
+        'contribution_data': contributions(project),
+        'velocity': [
+            {'day': day, 'total': total, 'height': round(total * 100 / peak)}
+            for day, total in velocity
+        ],
     }
     return render(request, 'analytics.html', context)
 
+@login_required
+def export_transitions(request, project_id):
+    project = get_object_or_404(Project, id=project_id)
+
+    # 🔒 Members only, same rule as chat and files
+    if request.user != project.owner and not project.members.filter(id=request.user.id).exists():
+        return HttpResponseForbidden()
+
+    # ?since=<ISO datetime> limits the time range, ?after=<id> resumes an export
+    try:
+        since = parse_datetime(request.GET.get('since', ''))
+    except ValueError:
+        # Well-formed but impossible, e.g. 2024-13-45T00:00
+        return HttpResponseBadRequest("Invalid 'since' datetime.")
+    after = request.GET.get('after', '')
+    rows = iter_transitions(project, since=since, after_id=int(after) if after.isdigit() else None)
+
+    response = StreamingHttpResponse(
+        (json.dumps(row) + '\n' for row in rows),
+        content_type='application/x-ndjson',
+    )
+    response['Content-Disposition'] = f'attachment; filename="project-{project.id}-transitions.ndjson"'
+    return response
+
 # --- 3. PEER REVIEW LOGIC ---
 def submit_review(request, project_id):
     project = get_object_or_404(Project, id=project_id)
@@ -82,93 +147,59 @@ def submit_review(request, project_id):
         rating = request.POST.get('rating')
         feedback = request.POST.get('feedback')
         
-        blob = TextBlob(feedback)
-        if blob.sentiment.polarity < -0.5:
-            print("WARNING: Toxic review detected!") 
-
+        # Sentiment is scored later in batches by the moderation worker
         PeerReview.objects.create(
             reviewer=request.user,
             reviewee_id=reviewee_id,
             rating=rating,
-            feedback=feedback
+            feedback=feedback,
+            feedback_hash=feedback_hash(feedback),
         )
         return redirect('board_view', project_id=project_id)
 
     return render(request, 'collaboration/review_form.html', {'project': project})
 
-# --- 4. AI TASK GENERATION LOGIC (ZERO-DEPENDENCY DIRECT API CALL) ---
+# --- 4. AI TASK GENERATION LOGIC (BACKGROUND JOB, see jobs.py) ---
 def generate_ai_tasks(request, project_id):
     project = get_object_or_404(Project, id=project_id)
 
+    if request.user != project.owner:
+        messages.error(request, "Only the Project Admin can generate tasks.")
+        return redirect('board_view', project_id=project.id)
+
     if not project.gemini_api_key:
         messages.error(request, "Please add a Gemini API Key to your project settings.")
         return redirect('board_view', project_id=project.id)
 
-    try:
-        api_key = project.gemini_api_key.strip()
-        
-    
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
+    # The worker (manage.py run_ai_worker) does the slow part; the board polls the job
+    enqueue_generation(project, request.user)
+    messages.success(request, "AI is drafting your tasks. They will appear on the board shortly.")
+    return redirect('board_view', project_id=project.id)
 
-        prompt = f"""
-        Act as a senior software architect. 
-        Break down the project into 5-7 actionable student tasks.
-        
-        For each task, provide:
-        1. A 'title' (short, descriptive).
-        2. A 'guide' (one paragraph) explaining how to do it and why.
-
-        Project: {project.title} - {project.description}
-
-        Return ONLY a JSON list of objects. Do not use markdown backticks.
-        [
-            {{"title": "Setup Git", "guide": "Initialize a repository..."}},
-            {{"title": "Base Layout", "guide": "Create the base.html template..."}}
-        ]
-        """
-
-        # Structuring the exact payload Google expects
-        payload = {
-            "contents": [{"parts": [{"text": prompt}]}]
-        }
-
-        # Making the raw HTTP POST request
-        req = urllib.request.Request(
-            url, 
-            data=json.dumps(payload).encode('utf-8'), 
-            headers={'Content-Type': 'application/json'}
-        )
-        
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
+@login_required
+def ai_job_status(request, job_id):
+    job = get_object_or_404(AIGenerationJob.objects.select_related('project'), id=job_id)
+    project = job.project
 
-        # Digging into the JSON response to grab the text
-        text_response = result['candidates'][0]['content']['parts'][0]['text']
-        
-       # Clean markdown backticks just in case the AI adds them
-        clean_text = text_response.strip().replace('```json', '').replace('```', '')
-        
-        # Parse the AI's JSON string into Python dictionaries
-        task_data = json.loads(clean_text)
-        for item in task_data:
-            Task.objects.create(
-                project=project,
-                title=item['title'],
-                description=item['guide'], 
-                status='TODO', 
-                assigned_to=None 
-            )
-
-        messages.success(request, f"Generated {len(task_data)} tasks with AI guides!")
-
-    except urllib.error.HTTPError as e:
-        # If the API rejects it, this prints the EXACT reason from Google
-        error_body = e.read().decode('utf-8')
-        print(f"GOOGLE API REJECTION: {error_body}")
-        messages.error(request, "API Error: Check your terminal for the exact rejection reason.")
-        
-    except Exception as e:
-        print(f"GENERAL ERROR: {e}") 
-        messages.error(request, "Task Generation failed. Check terminal for details.")
+    # 🔒 Members only, same rule as chat and files
+    if request.user != project.owner and not project.members.filter(id=request.user.id).exists():
+        return HttpResponseForbidden()
 
-    return redirect('board_view', project_id=project.id)
\ No newline at end of file
+    if request.headers.get('HX-Request'):
+        response = render(request, 'ai_job_status.html', {
+            'job': job, 'realtime': settings.REALTIME_ENABLED,
+        })
+        if job.created_count:
+            # Streamed tasks land while the job runs; the board's version check keeps this cheap
+            response['HX-Trigger'] = 'refreshBoard'
+        return response
+
+    return JsonResponse({
+        'id': job.id,
+        'status': job.status,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'created_count': job.created_count,
+        'error': job.error,
+        'updated_at': job.updated_at.isoformat(),
+    })
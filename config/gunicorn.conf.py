@@ -0,0 +1,19 @@
+# Optional gunicorn config that preloads the app and its heavy optional
+# dependencies in the master, so forked workers start warm and share the
+# memory pages:
+#   gunicorn -c config/gunicorn.conf.py config.wsgi
+# Without it every worker imports them lazily on first use instead.
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before workers fork
+    from django.db import connections
+
+    from config.startup import warm_up
+
+    timings = warm_up()
+    for name, seconds in timings.items():
+        server.log.info("Warm-up: imported %s in %.0f ms", name, seconds * 1000)
+    # Never hand an open DB connection down to the forked workers
+    connections.close_all()
@@ -109,3 +109,36 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = 'users.User'
 
 LOGIN_URL = 'login'
+
+# --- SEARCH ---
+# Full-text project search; the index itself is created by projects migration 0017
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', (
+    'projects.search.PostgresSearchBackend' if 'RENDER' in os.environ else 'projects.search.SQLiteSearchBackend'
+))
+
+# --- REALTIME (server-sent events) ---
+# Off by default: under WSGI a stream never ends and pins a worker per open
+# tab, so pages keep their 3s/5s polling. Set REALTIME_ENABLED=1 only when
+# serving config.asgi:application, e.g. gunicorn -k uvicorn.workers.UvicornWorker.
+# With several worker processes switch the broker to
+# 'projects.realtime.DatabaseBroker', and prune its table every few minutes
+# with python manage.py prune_realtime_events.
+REALTIME_ENABLED = os.environ.get('REALTIME_ENABLED', '0') == '1'
+REALTIME_BROKER = os.environ.get('REALTIME_BROKER', 'projects.realtime.InMemoryBroker')
+
+# --- AI TASK GENERATION ---
+# Generation runs in a background worker: python manage.py run_ai_worker
+# Point GEMINI_API_URL at `python manage.py fake_gemini` to work offline.
+GEMINI_API_URL = os.environ.get(
+    'GEMINI_API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash'
+)
+GEMINI_TIMEOUT = int(os.environ.get('GEMINI_TIMEOUT', 30))
+# Stream the answer so tasks appear one by one (GEMINI_STREAM=0 waits for all of them)
+GEMINI_STREAM = os.environ.get('GEMINI_STREAM', '1') != '0'
+
+# --- PROJECT FILE DOWNLOADS ---
+# Encrypted vault files are served by an authenticated view. Behind nginx use
+# 'x-accel' with an internal location for FILE_ACCEL_REDIRECT_PREFIX aliased to
+# MEDIA_ROOT (and don't expose MEDIA_ROOT/project_files publicly).
+FILE_DOWNLOAD_BACKEND = os.environ.get('FILE_DOWNLOAD_BACKEND', 'django')
+FILE_ACCEL_REDIRECT_PREFIX = os.environ.get('FILE_ACCEL_REDIRECT_PREFIX', '/protected-media/')
@@ -0,0 +1,69 @@
+# config/startup.py
+# Keeping worker boot cheap.
+#
+# Heavy optional libraries (textblob/nltk for moderation, Pillow for image
+# work) are only imported when a code path actually needs them, through
+# lazy_import(). Deployments that would rather pay that cost once can
+# preload everything in the gunicorn master with config/gunicorn.conf.py,
+# which calls warm_up() before the workers are forked.
+import importlib
+import threading
+import time
+
+from django.conf import settings
+
+# Modules warm_up() preloads: app modules first, then the heavy optional ones
+WARMUP_MODULES = getattr(settings, 'WARMUP_MODULES', [
+    settings.ROOT_URLCONF,
+    'textblob.sentiments',
+    'PIL.Image',
+    'PIL.ImageOps',
+])
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f'<LazyModule {self._name!r} ({state})>'
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def warm_up(modules=None):
+    """Import ``modules`` (default WARMUP_MODULES) now. Returns ``{name: seconds}``.
+
+    Missing optional packages are skipped, not fatal. Touches no database,
+    so it is safe to run in a pre-fork master.
+    """
+    timings = {}
+    for name in modules if modules is not None else WARMUP_MODULES:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
@@ -4,19 +4,20 @@ from django.urls import path
 from django.shortcuts import render
 from django.conf import settings
 from django.conf.urls.static import static
-from projects.views import delete_project_file
+from projects.views import delete_project_file, download_project_file
 
 # --- Import views neatly grouped by app ---
 from projects import views
 from users.views import profile_settings, register_view, login_view, logout_view
 
 from projects.views import (
-    project_matchmaking, request_join, manage_team, 
-    create_project, project_files, project_chat, edit_project, delete_project 
+    project_matchmaking, skill_autocomplete, request_join, manage_team, 
+    create_project, project_files, project_chat, project_chat_search, edit_project, delete_project,
+    project_events, upload_init, upload_detail, upload_chunk, upload_finalize
 )
 from collaboration.views import (
     board_view, add_task, update_task, project_analytics, 
-    submit_review, generate_ai_tasks 
+    submit_review, generate_ai_tasks, export_transitions, ai_job_status
 )
 
 def home(request):
@@ -33,24 +34,34 @@ urlpatterns = [
 
     # --- PROJECTS ---
     path('projects/find/', project_matchmaking, name='find_projects'),
+    path('skills/autocomplete/', skill_autocomplete, name='skill_autocomplete'),
     path('projects/create/', create_project, name='create_project'),
     path('project/<int:project_id>/join/', request_join, name='request_join'),
     path('project/<int:project_id>/manage/', manage_team, name='manage_team'),
     path('project/<int:project_id>/files/', project_files, name='project_files'),
+    path('project/<int:project_id>/uploads/', upload_init, name='upload_init'),
+    path('project/<int:project_id>/uploads/<uuid:upload_id>/', upload_detail, name='upload_detail'),
+    path('project/<int:project_id>/uploads/<uuid:upload_id>/chunk/', upload_chunk, name='upload_chunk'),
+    path('project/<int:project_id>/uploads/<uuid:upload_id>/finalize/', upload_finalize, name='upload_finalize'),
     path('project/<int:project_id>/chat/', project_chat, name='project_chat'),
+    path('project/<int:project_id>/chat/search/', project_chat_search, name='project_chat_search'),
+    path('project/<int:project_id>/events/', project_events, name='project_events'),
 
     # --- COLLABORATION ---
     path('project/<int:project_id>/board/', board_view, name='board_view'),
     path('project/<int:project_id>/add/', add_task, name='add_task'),
     path('task/<int:task_id>/update/<str:new_status>/', update_task, name='update_task'),
     path('project/<int:project_id>/analytics/', project_analytics, name='project_analytics'),
+    path('project/<int:project_id>/analytics/transitions/', export_transitions, name='export_transitions'),
     path('project/<int:project_id>/review/', submit_review, name='submit_review'),
     
     # --- NEW AI FEATURE ---
     path('project/<int:project_id>/generate-ai-tasks/', generate_ai_tasks, name='generate_ai_tasks'),
+    path('ai-job/<int:job_id>/', ai_job_status, name='ai_job_status'),
     path('project/<int:project_id>/edit/', edit_project, name='edit_project'),
     path('project/<int:project_id>/delete/', delete_project, name='delete_project'),
     path('file/<int:file_id>/delete/', delete_project_file, name='delete_project_file'),
+    path('file/<int:file_id>/download/', download_project_file, name='download_project_file'),
     path('profile/', profile_settings, name='profile_settings'),
 ]
 
@@ -0,0 +1,51 @@
+# projects/chat.py
+# Windowed, keyset-paginated access to a project's chat history.
+from django.conf import settings
+
+from .models import ProjectMessage
+from .search import get_backend, snippet_html
+
+# Messages per page, for the first render and for each "load older" fetch
+CHAT_PAGE_SIZE = getattr(settings, 'CHAT_PAGE_SIZE', 50)
+# Most messages a client keeps on screen before old ones are trimmed
+CHAT_MAX_WINDOW = getattr(settings, 'CHAT_MAX_WINDOW', 500)
+# Search hits per page; "more results" continues below the last id shown
+CHAT_SEARCH_PAGE_SIZE = getattr(settings, 'CHAT_SEARCH_PAGE_SIZE', 20)
+
+
+def history_page(messages, before=None, size=CHAT_PAGE_SIZE):
+    """Return ``(page, has_older)`` for a message queryset.
+
+    ``page`` holds the newest ``size`` messages with an id below ``before``
+    (or the very newest when ``before`` is None), oldest first. Seeks on
+    the (project, id) index, so the cost doesn't grow with history length.
+    """
+    newest_first = messages.order_by('-id')
+    if before is not None:
+        newest_first = newest_first.filter(id__lt=before)
+
+    page = list(newest_first[:size + 1])
+    has_older = len(page) > size
+    page = page[:size]
+    page.reverse()
+    return page, has_older
+
+
+def search_history(project, query, before=None, size=CHAT_SEARCH_PAGE_SIZE):
+    """Return ``(hits, has_more)``: matching messages newest first, each with a ``snippet``.
+
+    Keyset-paginated like history_page: pass the id of the last hit as
+    ``before`` for the next page.
+    """
+    rows = get_backend().search_messages(project.id, query, before, size + 1)
+    has_more = len(rows) > size
+    rows = rows[:size]
+
+    by_id = ProjectMessage.objects.select_related('sender').in_bulk([message_id for message_id, _ in rows])
+    hits = []
+    for message_id, marked in rows:
+        message = by_id.get(message_id)
+        if message is not None:
+            message.snippet = snippet_html(marked)
+            hits.append(message)
+    return hits, has_more
@@ -0,0 +1,106 @@
+# projects/deletion.py
+# Deleting a project without holding the request (or the database) hostage.
+#
+#   1. tombstone_project() stamps ``deleted_at``; Project.objects hides the
+#      project from then on, so the request returns at once.
+#   2. The deletion worker (manage.py run_deletion_worker) empties every
+#      child table in batches of PROJECT_DELETE_BATCH_SIZE rows, one short
+#      transaction each, then deletes the project row itself.
+#   3. Files are removed after the transaction that deleted their rows
+#      commits: unfinished upload parts here, ProjectFile blobs and the
+#      thumbnail by the post_delete receivers in signals.py.
+import os
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models.deletion import CASCADE, Collector
+from django.utils import timezone
+
+from .matching import bump_index_version, unindex_project_skills
+from .models import Project, ProjectFile, UploadSession
+from .uploads import part_path
+
+PROJECT_DELETE_BATCH_SIZE = getattr(settings, 'PROJECT_DELETE_BATCH_SIZE', 500)
+
+
+# --- 1. TOMBSTONE ---
+def tombstone_project(project):
+    """Hide ``project`` immediately; the deletion worker removes it later."""
+    with transaction.atomic():
+        Project.all_objects.filter(pk=project.pk, deleted_at__isnull=True).update(deleted_at=timezone.now())
+        # Matchmaking would otherwise keep counting it
+        unindex_project_skills(project)
+    bump_index_version()
+
+
+# --- 2. BATCHES ---
+def _child_relations():
+    # Every table that cascades from Project; the ones owning files go last
+    relations = [
+        rel for rel in Project._meta.related_objects
+        if rel.one_to_many and rel.on_delete is CASCADE
+    ]
+    return sorted(relations, key=lambda rel: rel.related_model in (ProjectFile, UploadSession))
+
+
+def _media_of(model, pks):
+    """Callables removing the files owned by the given rows, other than blobs."""
+    if model is UploadSession:
+        paths = [part_path(session) for session in UploadSession.objects.filter(pk__in=pks)]
+        return [lambda path=path: _remove(path) for path in paths]
+    return []
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _collect_and_delete(project, queryset):
+    # origin=project lets signal handlers tell this apart from deleting one row
+    collector = Collector(using=router.db_for_write(queryset.model), origin=project)
+    collector.collect(queryset)
+    collector.delete()
+
+
+def purge_batch(project, batch_size=PROJECT_DELETE_BATCH_SIZE):
+    """Delete up to ``batch_size`` child rows of a tombstoned project. Returns the count."""
+    for rel in _child_relations():
+        model = rel.related_model
+        pks = list(
+            model._base_manager.filter(**{rel.field.name: project})
+            .order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            continue
+        with transaction.atomic():
+            cleanups = _media_of(model, pks)
+            _collect_and_delete(project, model._base_manager.filter(pk__in=pks))
+            for cleanup in cleanups:
+                transaction.on_commit(cleanup)
+        return len(pks)
+    return 0
+
+
+def purge_project(project, batch_size=PROJECT_DELETE_BATCH_SIZE):
+    """Delete a tombstoned project batch by batch, then the project itself."""
+    removed = 0
+    while True:
+        deleted = purge_batch(project, batch_size)
+        if not deleted:
+            break
+        removed += deleted
+
+    with transaction.atomic():
+        # Only members, join requests and tags are left; post_delete releases the thumbnail
+        _collect_and_delete(project, Project.all_objects.filter(pk=project.pk))
+    return removed
+
+
+def purge_next(batch_size=PROJECT_DELETE_BATCH_SIZE):
+    """Purge the oldest tombstoned project. Returns it, or None when nothing is pending."""
+    project = Project.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at', 'pk').first()
+    if project is None:
+        return None
+    purge_project(project, batch_size)
+    return project
@@ -0,0 +1,128 @@
+# projects/downloads.py
+# Authenticated ProjectFile downloads.
+#
+# The view checks membership, then either streams the file itself (with
+# single-range support, so big encrypted blobs can be fetched in parallel
+# segments or resumed) or hands the transfer to the front server:
+#   FILE_DOWNLOAD_BACKEND = 'django'      -> FileResponse / ranged stream
+#   FILE_DOWNLOAD_BACKEND = 'x-accel'     -> nginx X-Accel-Redirect to an internal location
+#   FILE_DOWNLOAD_BACKEND = 'x-sendfile'  -> Apache / lighttpd X-Sendfile
+# Every response carries an ETag and Last-Modified, so a repeat download
+# is answered with 304 Not Modified.
+import os
+import re
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+FILE_DOWNLOAD_BACKEND = getattr(settings, 'FILE_DOWNLOAD_BACKEND', 'django')
+# Internal nginx location mapped onto MEDIA_ROOT, e.g. location /protected-media/ { internal; alias ...; }
+FILE_ACCEL_REDIRECT_PREFIX = getattr(settings, 'FILE_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+_BLOCK_SIZE = 64 * 1024
+
+
+def _validators(project_file):
+    storage = project_file.file.storage
+    size = project_file.file.size
+    try:
+        modified = storage.get_modified_time(project_file.file.name)
+    except (NotImplementedError, OSError):
+        modified = project_file.uploaded_at
+    last_modified = int(modified.astimezone(dt_timezone.utc).timestamp())
+    etag = f'"{project_file.id}-{size:x}-{last_modified:x}"'
+    return size, etag, last_modified
+
+
+def parse_range(header, size):
+    """``(start, end)`` inclusive for a single ``bytes=`` range, None to ignore, False if unsatisfiable."""
+    match = _RANGE_RE.match(header.strip())
+    if match is None:
+        # Multi-range or malformed: serve the whole file, which RFC 9110 allows
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            block = handle.read(min(_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def serve_project_file(request, project_file):
+    size, etag, last_modified = _validators(project_file)
+    filename = os.path.basename(project_file.file.name)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    if FILE_DOWNLOAD_BACKEND in ('x-accel', 'x-sendfile'):
+        # The front server streams the bytes and handles Range itself
+        response = HttpResponse(content_type='application/octet-stream')
+        if FILE_DOWNLOAD_BACKEND == 'x-accel':
+            response['X-Accel-Redirect'] = FILE_ACCEL_REDIRECT_PREFIX + project_file.file.name
+        else:
+            response['X-Sendfile'] = project_file.file.path
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    else:
+        byte_range = None
+        if request.headers.get('Range') and _if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(request.headers['Range'], size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        elif byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _read_range(project_file.file.path, start, length) if request.method != 'HEAD' else iter(()),
+                status=206, content_type='application/octet-stream',
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(length)
+        else:
+            # Whole file: FileResponse lets the WSGI server use sendfile()
+            response = FileResponse(
+                project_file.file.open('rb'), as_attachment=True, filename=filename,
+                content_type='application/octet-stream',
+            )
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Cached by the browser only, and always revalidated (cheap 304s)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -1,14 +1,22 @@
 from django import forms
 from django.core.validators import FileExtensionValidator
+from django.urls import reverse_lazy
 from taggit.forms import TagWidget
 from .models import Project, ProjectFile, ProjectMessage
 
+
+class SkillTagWidget(TagWidget):
+    # Suggests existing tags as you type (see skill_autocomplete and base.html)
+    def __init__(self, attrs=None):
+        super().__init__({'data-skill-autocomplete': reverse_lazy('skill_autocomplete'), 'autocomplete': 'off', **(attrs or {})})
+
+
 class ProjectForm(forms.ModelForm):
     class Meta:
         model = Project
         fields = ['title', 'description', 'thumbnail', 'required_skills', 'gemini_api_key']
         widgets = {
-            'required_skills': TagWidget(attrs={
+            'required_skills': SkillTagWidget(attrs={
                 'class': 'w-full border border-gray-300 p-2 rounded focus:outline-none focus:ring-2 focus:ring-blue-500',
                 'placeholder': 'e.g. python, django, css'
             }),
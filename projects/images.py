@@ -0,0 +1,160 @@
+# projects/images.py
+# Resized WebP variants of Project.thumbnail and User.profile_picture.
+#
+# Saving an image only queues an ImageVariantJob row. The image worker
+# (manage.py run_image_worker) renders queued images in its own process
+# pool, so no Pillow work or forking happens in the web workers, and writes
+# the variants next to the original:
+#     blobs/9f/86/9f86...a08.png  ->  blobs/9f/86/9f86...a08.w320.webp
+# The widths produced are recorded on the row (``thumbnail_variants`` /
+# ``profile_picture_variants``) so templates get a srcset without touching
+# the disk. manage.py build_image_variants backfills existing media.
+import logging
+import os
+
+from django.conf import settings
+from django.db import transaction
+
+from config.startup import lazy_import
+
+Image = lazy_import('PIL.Image')
+ImageOps = lazy_import('PIL.ImageOps')
+
+logger = logging.getLogger(__name__)
+
+# kind -> (widths, square crop). Cards are cropped by CSS, avatars here.
+IMAGE_VARIANTS = getattr(settings, 'IMAGE_VARIANTS', {
+    'card': ([320, 640, 960], False),
+    'avatar': ([64, 128, 256], True),
+})
+IMAGE_WEBP_QUALITY = getattr(settings, 'IMAGE_WEBP_QUALITY', 80)
+# Render processes of one run_image_worker, and images it takes per batch
+IMAGE_WORKERS = getattr(settings, 'IMAGE_WORKERS', 2)
+IMAGE_BATCH_SIZE = getattr(settings, 'IMAGE_BATCH_SIZE', 20)
+
+
+def variant_name(name, width, square=False):
+    stem = os.path.splitext(name)[0]
+    return f"{stem}.{'sq' if square else 'w'}{width}.webp"
+
+
+def variant_names(name):
+    """Every variant name ``name`` could have under the current settings."""
+    return [
+        variant_name(name, width, square)
+        for widths, square in IMAGE_VARIANTS.values()
+        for width in widths
+    ]
+
+
+# --- 1. RENDERING (runs in the pool) ---
+def render_variants(path, widths, square):
+    """Write the WebP variants of the image at ``path``. Returns the widths written.
+
+    Never upscales: widths larger than the source are skipped.
+    """
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+        source_width = min(image.size) if square else image.width
+
+        written = []
+        for width in sorted(widths):
+            if width > source_width:
+                break
+            if square:
+                variant = ImageOps.fit(image, (width, width), Image.Resampling.LANCZOS)
+            else:
+                height = max(round(image.height * width / image.width), 1)
+                variant = image.resize((width, height), Image.Resampling.LANCZOS)
+
+            target = variant_name(path, width, square)
+            temp = f'{target}.{os.getpid()}.tmp'
+            variant.save(temp, 'WEBP', quality=IMAGE_WEBP_QUALITY, method=4)
+            os.replace(temp, target)
+            written.append(width)
+        return written
+
+
+# --- 2. QUEUEING (runs in the web process) ---
+def image_fields():
+    """``(model, image field, variants field, kind)`` for every image with variants."""
+    from django.contrib.auth import get_user_model
+    from .models import Project
+
+    return [
+        (Project, 'thumbnail', 'thumbnail_variants', 'card'),
+        (get_user_model(), 'profile_picture', 'profile_picture_variants', 'avatar'),
+    ]
+
+
+def enqueue_variants(rows):
+    """Queue ``[(instance, image name), ...]``; a row already queued is re-pointed at the new name."""
+    from .models import ImageVariantJob
+
+    ImageVariantJob.objects.bulk_create(
+        [ImageVariantJob(model=instance._meta.label_lower, object_id=instance.pk, name=name)
+         for instance, name in rows],
+        update_conflicts=True, unique_fields=['model', 'object_id'], update_fields=['name'],
+    )
+
+
+def schedule_variants(instance, field, variants_field, kind):
+    """Queue variants of ``instance.<field>`` once the current transaction commits."""
+    image = getattr(instance, field)
+    if not image or (getattr(instance, variants_field) or {}).get('name') == image.name:
+        return
+    name = image.name
+    transaction.on_commit(lambda: enqueue_variants([(instance, name)]))
+
+
+# --- 3. WORKER (manage.py run_image_worker) ---
+def render_pending(batch_size=IMAGE_BATCH_SIZE, pool=None):
+    """Render one batch of queued images. Returns how many jobs were handled.
+
+    The Pillow work runs in ``pool`` (the worker's ProcessPoolExecutor) when
+    given, else inline; the rows are only ever written from this thread.
+    """
+    from .models import ImageVariantJob
+
+    jobs = list(ImageVariantJob.objects.order_by('id')[:batch_size])
+    if not jobs:
+        return 0
+    fields = {model._meta.label_lower: (model, *rest) for model, *rest in image_fields()}
+
+    pending = []
+    for job in jobs:
+        model, field, variants_field, kind = fields[job.model]
+        widths, square = IMAGE_VARIANTS[kind]
+        args = (model._meta.get_field(field).storage.path(job.name), widths, square)
+        pending.append((job, pool.submit(render_variants, *args) if pool else args))
+
+    for job, work in pending:
+        model, field, variants_field, kind = fields[job.model]
+        try:
+            widths = work.result() if pool else render_variants(*work)
+        except Exception:
+            logger.exception("Could not render %s variants of %s", kind, job.name)
+            widths = None
+        with transaction.atomic():
+            if widths is not None:
+                # Only if the row still points at this image; a newer upload wins
+                model._base_manager.filter(pk=job.object_id, **{field: job.name}).update(
+                    **{variants_field: {'name': job.name, 'widths': widths}}
+                )
+            # A job re-pointed at a newer upload meanwhile stays for the next
+            # batch; a failed render is dropped rather than retried forever
+            ImageVariantJob.objects.filter(id=job.id, name=job.name).delete()
+    return len(jobs)
+
+
+# --- 4. TEMPLATES ---
+def srcset(image, variants, kind):
+    """``"url 320w, url 640w"`` for the variants of ``image``, or '' if none are ready."""
+    if not image or not variants or variants.get('name') != image.name:
+        return ''
+    square = IMAGE_VARIANTS[kind][1]
+    return ', '.join(
+        f'{image.storage.url(variant_name(image.name, width, square))} {width}w'
+        for width in variants.get('widths', [])
+    )
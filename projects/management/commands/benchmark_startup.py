@@ -0,0 +1,104 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# What a fresh worker does before serving its first request
+BOOT_SCRIPT = """
+import importlib, json, sys, time
+
+# -X importtime only logs import statements; route Django's import_module()
+# calls (apps, models, settings) through __import__ so they are logged too
+_import_module = importlib.import_module
+def _logged_import(name, package=None):
+    if package or name.startswith('.'):
+        return _import_module(name, package)
+    __import__(name)
+    return sys.modules[name]
+importlib.import_module = _logged_import
+
+started = time.perf_counter()
+import django
+django.setup()
+importlib.import_module({urlconf!r})
+booted = time.perf_counter() - started
+warmup = None
+if {warmup!r}:
+    from config.startup import warm_up
+    started = time.perf_counter()
+    warm_up()
+    warmup = time.perf_counter() - started
+print(json.dumps({{'boot': booted, 'warmup': warmup}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure worker boot time and the import cost of each app module (python -X importtime)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters to average over.")
+        parser.add_argument('--top', type=int, default=10, help="Heaviest third-party modules to list.")
+        parser.add_argument('--warmup', action='store_true', help="Also time config.startup.warm_up().")
+
+    def handle(self, *args, **options):
+        local_packages = {'config'} | {
+            app.name.split('.')[0] for app in apps.get_app_configs()
+            if os.path.abspath(app.path).startswith(str(settings.BASE_DIR))
+        }
+        script = BOOT_SCRIPT.format(urlconf=settings.ROOT_URLCONF, warmup=options['warmup'])
+
+        boots, warmups = [], []
+        local, third_party = {}, {}
+        for _ in range(max(options['repeat'], 1)):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', script],
+                capture_output=True, text=True, cwd=settings.BASE_DIR,
+                env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')},
+            )
+            if result.returncode:
+                self.stderr.write(result.stderr[-2000:])
+                return
+            timings = json.loads(result.stdout.strip().splitlines()[-1])
+            boots.append(timings['boot'])
+            if timings['warmup'] is not None:
+                warmups.append(timings['warmup'])
+
+            for name, cumulative in self._parse(result.stderr):
+                top = name.split('.')[0]
+                if top in local_packages:
+                    local.setdefault(name, []).append(cumulative)
+                elif '.' not in name and top not in sys.stdlib_module_names:
+                    third_party.setdefault(name, []).append(cumulative)
+
+        self.stdout.write(f"Worker boot (setup + URLconf): {statistics.median(boots) * 1000:.0f} ms median")
+        if warmups:
+            self.stdout.write(f"warm_up(): {statistics.median(warmups) * 1000:.0f} ms median")
+
+        self.stdout.write("\nApp modules (cumulative import time):")
+        for name, ms in self._ranked(local):
+            self.stdout.write(f"  {ms:8.1f} ms  {name}")
+
+        self.stdout.write(f"\nHeaviest third-party packages (top {options['top']}):")
+        for name, ms in self._ranked(third_party)[:options['top']]:
+            self.stdout.write(f"  {ms:8.1f} ms  {name}")
+
+    @staticmethod
+    def _parse(stderr):
+        # "import time: self [us] | cumulative | imported package"
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            yield name.strip(), int(cumulative)
+
+    @staticmethod
+    def _ranked(samples):
+        return sorted(
+            ((name, statistics.median(values) / 1000) for name, values in samples.items()),
+            key=lambda item: -item[1],
+        )
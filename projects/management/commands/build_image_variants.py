@@ -0,0 +1,35 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from projects.images import enqueue_variants, image_fields
+
+
+class Command(BaseCommand):
+    help = "Queue resized WebP variants for existing thumbnails and profile pictures, then render them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Re-render images that already have variants.")
+        parser.add_argument('--queue-only', action='store_true',
+                            help="Only queue; leave rendering to a running run_image_worker.")
+
+    def handle(self, *args, **options):
+        queued = 0
+        for model, field, variants_field, kind in image_fields():
+            rows = model._base_manager.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+            batch = []
+            for row in rows.only('pk', field, variants_field).iterator(chunk_size=500):
+                image = getattr(row, field)
+                if not options['force'] and (getattr(row, variants_field) or {}).get('name') == image.name:
+                    continue
+                batch.append((row, image.name))
+                if len(batch) >= 500:
+                    enqueue_variants(batch)
+                    queued += len(batch)
+                    batch = []
+            if batch:
+                enqueue_variants(batch)
+                queued += len(batch)
+        self.stdout.write(f"Queued {queued} images.")
+
+        if not options['queue_only']:
+            call_command('run_image_worker', once=True, stdout=self.stdout, stderr=self.stderr)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from projects.uploads import UPLOAD_SESSION_TTL, expire_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Remove chunked uploads that were started but never finalized."
+
+    def handle(self, *args, **options):
+        removed = expire_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} unfinished uploads idle for more than {UPLOAD_SESSION_TTL}."
+        ))
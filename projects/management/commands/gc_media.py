@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from projects.media_gc import MEDIA_GC_BATCH_SIZE, find_orphans, remove_orphan
+
+
+class Command(BaseCommand):
+    help = "Remove files under MEDIA_ROOT that no database row references."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be removed.")
+        parser.add_argument('--grace', type=int, default=60,
+                            help="Minutes a new file is left alone (its row may not be saved yet).")
+        parser.add_argument('--batch-size', type=int, default=MEDIA_GC_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        removed = reclaimed = kept = 0
+
+        for name, size in find_orphans(options['grace'] * 60, options['batch_size']):
+            if not dry_run and not remove_orphan(name):
+                kept += 1
+                continue
+            removed += 1
+            reclaimed += size
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"{'Would remove' if dry_run else 'Removed'} {name} ({size} bytes)")
+
+        verb = 'Would reclaim' if dry_run else 'Reclaimed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {filesizeformat(reclaimed)} ({reclaimed} bytes) from {removed} orphaned files."
+            + (f" {kept} came back into use and were kept." if kept else "")
+        ))
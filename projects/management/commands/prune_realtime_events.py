@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from projects.realtime import REALTIME_EVENT_RETENTION, prune_events
+
+
+class Command(BaseCommand):
+    help = "Delete realtime event rows (DatabaseBroker) older than the retention period. Run it every few minutes."
+
+    def handle(self, *args, **options):
+        removed = prune_events()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} realtime events older than {REALTIME_EVENT_RETENTION}."
+        ))
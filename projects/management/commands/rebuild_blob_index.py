@@ -0,0 +1,78 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from projects.models import StoredBlob
+from projects.storage import blob_storage, file_fields, is_blob_name, referenced_names
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount StoredBlob references from the database. With --adopt, legacy "
+        "files are first moved into the content-addressed layout (deduplicating them)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adopt', action='store_true', help="Move pre-blob files into blobs/ and repoint their rows.")
+        parser.add_argument(
+            '--grace', type=int, default=60,
+            help="Minutes a blob without references is kept (an upload may still be saving its row).",
+        )
+
+    def handle(self, *args, **options):
+        storage = blob_storage()
+        if options['adopt']:
+            self._adopt(storage)
+
+        # --- 1. RECOUNT ---
+        counts = Counter(name for name in referenced_names() if is_blob_name(name))
+        known = dict(StoredBlob.objects.values_list('name', 'refcount'))
+
+        missing = [
+            StoredBlob(name=name, size=storage.size(name), refcount=count)
+            for name, count in counts.items() if name not in known and storage.exists(name)
+        ]
+        StoredBlob.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+
+        wrong = [StoredBlob(name=name, refcount=count) for name, count in counts.items()
+                 if name in known and known[name] != count]
+        for blob in wrong:
+            StoredBlob.objects.filter(name=blob.name).update(refcount=blob.refcount)
+
+        # --- 2. UNREFERENCED BLOBS ---
+        cutoff = timezone.now() - timedelta(minutes=options['grace'])
+        unreferenced = [name for name in known if name not in counts]
+        removed = 0
+        for name in StoredBlob.objects.filter(name__in=unreferenced, created_at__lt=cutoff).values_list('name', flat=True):
+            StoredBlob.objects.filter(name=name).update(refcount=0)
+            storage.release(name)
+            removed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(counts.values())} references to {len(counts)} blobs: "
+            f"{len(missing)} indexed, {len(wrong)} recounted, {removed} unreferenced removed."
+        ))
+
+    def _adopt(self, storage):
+        adopted = {}
+        for model, field in file_fields():
+            rows = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+            for pk, name in rows.values_list('pk', field).iterator(chunk_size=500):
+                if is_blob_name(name):
+                    continue
+                if name not in adopted:
+                    if not storage.exists(name):
+                        self.stderr.write(f"Missing file, left as is: {name}")
+                        continue
+                    with storage.open(name, 'rb') as legacy:
+                        adopted[name] = storage.save(name, File(legacy))
+                    # The recount below sets the real number of references
+                    StoredBlob.objects.filter(name=adopted[name]).update(refcount=0)
+                model.objects.filter(pk=pk).update(**{field: adopted[name]})
+
+        for name in adopted:
+            storage.delete(name)
+        self.stdout.write(f"Adopted {len(adopted)} legacy files into {len(set(adopted.values()))} blobs.")
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from projects.matching import bump_index_version, rebuild_project_index
+from projects.models import Project
+from projects.skills import update_skill_mask
+
+
+class Command(BaseCommand):
+    help = "Rebuild the matchmaking skill index and the skill bitsets of every project and user."
+
+    def handle(self, *args, **options):
+        total = 0
+        for project in Project.objects.only('id', 'created_at').iterator(chunk_size=500):
+            rebuild_project_index(project)
+            update_skill_mask(project, project.required_skills)
+            total += 1
+
+        users = 0
+        for user in get_user_model().objects.only('id').iterator(chunk_size=500):
+            update_skill_mask(user, user.skills)
+            users += 1
+        # Masks were written with update(); make every process reload them
+        bump_index_version()
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {total} projects and {users} users."))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from projects.recommendations import refresh_all
+
+
+class Command(BaseCommand):
+    help = "Precompute the suggested teammates of every project."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Refresh once and exit instead of repeating.")
+        parser.add_argument('--sleep', type=float, default=900.0,
+                            help="Seconds to wait between refreshes.")
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                close_old_connections()
+                started = time.monotonic()
+                total = refresh_all()
+                self.stdout.write(f"Refreshed {total} projects in {time.monotonic() - started:.1f}s.")
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Recommendation worker stopped."))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from projects.deletion import PROJECT_DELETE_BATCH_SIZE, purge_next
+
+
+class Command(BaseCommand):
+    help = "Purge deleted projects, their rows and their media in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once nothing is pending instead of waiting for more.")
+        parser.add_argument('--batch-size', type=int, default=PROJECT_DELETE_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=10.0,
+                            help="Seconds to wait between polls when nothing is pending.")
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                close_old_connections()
+                project = purge_next(options['batch_size'])
+                if project is not None:
+                    total += 1
+                    self.stdout.write(f"Purged project {project.pk} ({project.title}).")
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Deletion worker stopped after {total} projects."))
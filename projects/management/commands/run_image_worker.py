@@ -0,0 +1,41 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from projects.images import IMAGE_BATCH_SIZE, IMAGE_WORKERS, render_pending
+
+
+class Command(BaseCommand):
+    help = "Render queued WebP variants of thumbnails and profile pictures."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once nothing is pending instead of waiting for more.")
+        parser.add_argument('--batch-size', type=int, default=IMAGE_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=IMAGE_WORKERS,
+                            help="Render processes; 0 renders in this process.")
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help="Seconds to wait between polls when nothing is pending.")
+
+    def handle(self, *args, **options):
+        total = 0
+        pool = ProcessPoolExecutor(max_workers=options['workers']) if options['workers'] else None
+        try:
+            while True:
+                close_old_connections()
+                handled = render_pending(options['batch_size'], pool)
+                total += handled
+                if handled:
+                    self.stdout.write(f"Rendered {handled} images.")
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        self.stdout.write(self.style.SUCCESS(f"Image worker stopped after {total} images."))
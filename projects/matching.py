@@ -0,0 +1,177 @@
+# projects/matching.py
+# Skill-based matchmaking.
+#
+# The ProjectSkillIndex inverted index (one row per skill tag and project)
+# picks the candidates: only projects sharing at least one of the user's
+# skills are read, so the cost grows with how many projects share them, not
+# with the number of projects. Each candidate's overlap is then a popcount
+# of the two skill bitsets (skills.py).
+import heapq
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+
+from .models import Project, ProjectSkillIndex
+from .skills import decode_mask
+
+# How many scored matches are kept per user; anything past this is listed by recency
+MATCHMAKING_TOP_K = getattr(settings, 'MATCHMAKING_TOP_K', 500)
+MATCHMAKING_PAGE_SIZE = getattr(settings, 'MATCHMAKING_PAGE_SIZE', 24)
+MATCHMAKING_CACHE_TIMEOUT = getattr(settings, 'MATCHMAKING_CACHE_TIMEOUT', 300)
+# Candidate projects whose skill bitsets are fetched per query
+MATCHMAKING_CHUNK_SIZE = getattr(settings, 'MATCHMAKING_CHUNK_SIZE', 500)
+
+_VERSION_KEY = 'matchmaking:index-version'
+
+
+# --- 1. INDEX MAINTENANCE ---
+def index_project_skills(project, tag_ids):
+    """Add index rows for the given tag ids of ``project``."""
+    rows = [
+        ProjectSkillIndex(tag_id=tag_id, project=project, project_created_at=project.created_at)
+        for tag_id in tag_ids
+    ]
+    ProjectSkillIndex.objects.bulk_create(rows, ignore_conflicts=True)
+    bump_index_version()
+
+
+def unindex_project_skills(project, tag_ids=None):
+    """Drop index rows for ``project`` (all of them when ``tag_ids`` is None)."""
+    rows = ProjectSkillIndex.objects.filter(project=project)
+    if tag_ids is not None:
+        rows = rows.filter(tag_id__in=tag_ids)
+    rows.delete()
+    bump_index_version()
+
+
+def rebuild_project_index(project):
+    """Resync the index rows of one project with its current tags."""
+    tag_ids = set(project.required_skills.values_list('id', flat=True))
+    ProjectSkillIndex.objects.filter(project=project).exclude(tag_id__in=tag_ids).delete()
+    index_project_skills(project, tag_ids)
+
+
+# --- 2. CACHED RANKINGS ---
+def bump_index_version():
+    # Any project skill change invalidates every cached ranking at once
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 1, None)
+
+
+def _ranking_key(user_id):
+    version = cache.get_or_set(_VERSION_KEY, 1, None)
+    return f'matchmaking:{version}:{user_id}'
+
+
+def forget_user_ranking(user_id):
+    cache.delete(_ranking_key(user_id))
+
+
+def score_candidates(user, limit=MATCHMAKING_TOP_K):
+    """``[(project_id, overlap), ...]`` best first; ties go to the newer project."""
+    mask = decode_mask(user.skill_mask)
+    if not mask:
+        return []
+    candidates = ProjectSkillIndex.objects.filter(
+        tag_id__in=user.skills.values('id')
+    ).values_list('project_id', flat=True).distinct()
+
+    scored = []
+    ids = list(candidates)
+    for start in range(0, len(ids), MATCHMAKING_CHUNK_SIZE):
+        rows = Project.objects.filter(id__in=ids[start:start + MATCHMAKING_CHUNK_SIZE])
+        for project_id, project_mask, created_at in rows.values_list('id', 'skill_mask', 'created_at'):
+            overlap = (mask & decode_mask(project_mask)).bit_count()
+            if overlap:
+                scored.append((overlap, created_at, project_id))
+    return [(project_id, overlap) for overlap, _, project_id in heapq.nlargest(limit, scored)]
+
+
+def ranked_matches(user):
+    """Return the user's top-K ``[(project_id, match_count), ...]``, best first.
+
+    Only the projects sharing one of the user's skills are scored; the
+    result is cached until the user's skills or any project's change.
+    """
+    key = _ranking_key(user.id)
+    ranked = cache.get(key)
+    if ranked is None:
+        ranked = score_candidates(user)
+        cache.set(key, ranked, MATCHMAKING_CACHE_TIMEOUT)
+    return ranked
+
+
+# --- 3. PAGINATABLE RESULTS ---
+def card_queryset():
+    # Everything a matchmaking card renders, fetched up front: owner via JOIN,
+    # tags and member ids via one prefetch query each for the whole page.
+    return Project.objects.select_related('owner').prefetch_related(
+        'required_skills',
+        Prefetch('members', queryset=get_user_model().objects.only('id')),
+    )
+
+
+class MatchResults:
+    """Lazy sequence of projects for ``Paginator``.
+
+    Ranked matches come first, followed by every other project newest
+    first (unless ``include_rest`` is False, as for search results). Only
+    the slice for the requested page is ever loaded.
+    """
+
+    def __init__(self, ranked, include_rest=True):
+        self.ranked = ranked
+        if include_rest:
+            self.rest = card_queryset().exclude(
+                id__in=[project_id for project_id, _ in ranked]
+            ).order_by('-created_at', '-id')
+        else:
+            self.rest = card_queryset().none()
+
+    def count(self):
+        return len(self.ranked) + self.rest.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+
+        start, stop = key.start or 0, key.stop
+        head = self.ranked[start:stop]
+        by_id = card_queryset().in_bulk([project_id for project_id, _ in head])
+        page = [by_id[project_id] for project_id, _ in head if project_id in by_id]
+
+        if stop is None or stop > len(self.ranked):
+            offset = max(start - len(self.ranked), 0)
+            limit = None if stop is None else stop - len(self.ranked)
+            page.extend(self.rest[offset:limit])
+        return page
+
+
+def build_cards(projects, user):
+    """Attach the per-card flags the matchmaking template needs.
+
+    Sets ``skill_tags`` (``(name, matched)`` pairs), ``matched_skills``,
+    ``match_count`` and ``is_member`` on each project so the template never
+    touches a related manager.
+    """
+    user_skill_ids = set()
+    if user.is_authenticated:
+        user_skill_ids = set(user.skills.values_list('id', flat=True))
+
+    for project in projects:
+        tags = project.required_skills.all()
+        project.skill_tags = [(tag.name, tag.id in user_skill_ids) for tag in tags]
+        project.matched_skills = [name for name, matched in project.skill_tags if matched]
+        project.match_count = len(project.matched_skills)
+        project.is_member = user.is_authenticated and (
+            project.owner_id == user.id
+            or any(member.id == user.id for member in project.members.all())
+        )
+    return projects
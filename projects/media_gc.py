@@ -0,0 +1,149 @@
+# projects/media_gc.py
+# Finding media files nothing in the database points at.
+#
+# MEDIA_ROOT is walked with os.scandir one directory at a time, and the
+# files are checked against the database in batches of MEDIA_GC_BATCH_SIZE
+# names (one ``IN`` query per FileField/ImageField column), so memory stays
+# flat however many files there are. A file counts as referenced when:
+#   - any FileField/ImageField row holds its name (soft-deleted projects included),
+#   - it is a resized variant (images.py) of a referenced image,
+#   - it is the partial file of a live UploadSession,
+#   - or it was written within the grace period (an upload may still be saving its row).
+import os
+import re
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+
+from .models import StoredBlob, UploadSession
+from .storage import is_blob_name
+from .uploads import UPLOAD_TEMP_DIR
+
+MEDIA_GC_BATCH_SIZE = getattr(settings, 'MEDIA_GC_BATCH_SIZE', 1000)
+
+_VARIANT_RE = re.compile(r'^(?P<stem>.+)\.(?:w|sq)\d+\.webp$')
+# Extensions a source image can have (blob names are lower case, older uploads may not be)
+_IMAGE_EXTENSIONS = getattr(settings, 'MEDIA_GC_IMAGE_EXTENSIONS', [
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp', '.tif', '.tiff', '.ico', '',
+])
+_PART_RE = re.compile(r'^(?P<id>[0-9a-f-]{36})\.part$')
+
+
+def file_columns():
+    """``(model, field_name)`` for every FileField/ImageField in the project."""
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+# --- 1. WALKING ---
+def walk_media(root=None):
+    """Yield ``(name, size, mtime)`` for every file under MEDIA_ROOT, names relative with '/'."""
+    root = str(root or settings.MEDIA_ROOT)
+    pending = ['']
+    while pending:
+        relative = pending.pop()
+        try:
+            entries = os.scandir(os.path.join(root, relative))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                name = f'{relative}/{entry.name}' if relative else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    yield name, stat.st_size, stat.st_mtime
+
+
+# --- 2. CHECKING ---
+def _parts_dir():
+    parts = os.path.relpath(UPLOAD_TEMP_DIR, settings.MEDIA_ROOT).replace(os.sep, '/')
+    return None if parts.startswith('..') else parts
+
+
+def referenced(names, columns=None):
+    """The subset of ``names`` that something in the database still uses."""
+    columns = columns if columns is not None else file_columns()
+    names = list(names)
+    found = set()
+
+    for model, field in columns:
+        found.update(model._base_manager.filter(**{f'{field}__in': names}).values_list(field, flat=True))
+
+    # Variants live as long as the image they were made from. A source keeps
+    # its extension, which the variant name dropped, so each stem is tried
+    # with every extension an image field may hold: one ``IN`` per column.
+    stems = {}
+    for name in names:
+        match = _VARIANT_RE.match(name)
+        if match and name not in found:
+            stems.setdefault(match['stem'], []).append(name)
+    if stems:
+        sources = [stem + ext for stem in stems for ext in {*_IMAGE_EXTENSIONS, *map(str.upper, _IMAGE_EXTENSIONS)}]
+        for model, field in columns:
+            for source in model._base_manager.filter(**{f'{field}__in': sources}).values_list(field, flat=True):
+                found.update(stems.get(os.path.splitext(source)[0], []))
+
+    parts_dir = _parts_dir()
+    if parts_dir is not None:
+        parts = {}
+        for name in names:
+            directory, _, base = name.rpartition('/')
+            match = _PART_RE.match(base)
+            if directory == parts_dir and match:
+                parts[match['id']] = name
+        if parts:
+            live = UploadSession.objects.filter(id__in=list(parts)).values_list('id', flat=True)
+            found.update(parts[str(session_id)] for session_id in live)
+    return found
+
+
+def find_orphans(grace_seconds=3600, batch_size=MEDIA_GC_BATCH_SIZE, root=None):
+    """Yield ``(name, size)`` for every unreferenced file older than the grace period."""
+    columns = file_columns()
+    cutoff = time.time() - grace_seconds
+    batch = {}
+
+    def flush():
+        used = referenced(batch, columns)
+        for name, size in batch.items():
+            if name not in used:
+                yield name, size
+        batch.clear()
+
+    for name, size, mtime in walk_media(root):
+        if mtime >= cutoff:
+            continue
+        batch[name] = size
+        if len(batch) >= batch_size:
+            yield from flush()
+    if batch:
+        yield from flush()
+
+
+# --- 3. REMOVING ---
+def remove_orphan(name, root=None):
+    """Delete one orphaned file (and its StoredBlob row). Returns False if it came back into use."""
+    path = os.path.join(str(root or settings.MEDIA_ROOT), *name.split('/'))
+    if not is_blob_name(name):
+        if os.path.exists(path):
+            os.remove(path)
+        return True
+
+    with transaction.atomic():
+        # Deleting the row first makes a concurrent save of the same bytes wait,
+        # and then write the blob again; a fresh reference keeps the file
+        StoredBlob.objects.filter(name=name).delete()
+        if referenced([name]):
+            transaction.set_rollback(True)
+            return False
+        if os.path.exists(path):
+            os.remove(path)
+    return True
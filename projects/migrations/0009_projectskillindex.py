@@ -0,0 +1,50 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_skill_index(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Project = apps.get_model('projects', 'Project')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    ProjectSkillIndex = apps.get_model('projects', 'ProjectSkillIndex')
+
+    content_type = ContentType.objects.filter(app_label='projects', model='project').first()
+    if content_type is None:
+        return
+
+    created = dict(Project.objects.values_list('id', 'created_at'))
+    rows = [
+        ProjectSkillIndex(tag_id=tag_id, project_id=project_id, project_created_at=created[project_id])
+        for tag_id, project_id in TaggedItem.objects.filter(content_type=content_type)
+        .values_list('tag_id', 'object_id').iterator()
+        if project_id in created
+    ]
+    ProjectSkillIndex.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('projects', '0008_alter_project_gemini_api_key'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSkillIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_created_at', models.DateTimeField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to='projects.project')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_index', to='taggit.tag')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tag', 'project_created_at'], name='projects_pr_tag_id_8fa172_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tag', 'project'), name='unique_project_skill')],
+            },
+        ),
+        migrations.RunPython(backfill_skill_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_projectskillindex'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectmessage',
+            index=models.Index(fields=['project', 'id'], name='projectmessage_cursor_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_realtimeevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='board_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
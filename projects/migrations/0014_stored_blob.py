@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:56
+
+import projects.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0013_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.BigIntegerField(default=0)),
+                ('refcount', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, storage=projects.storage.blob_storage, upload_to='project_thumbnails/'),
+        ),
+        migrations.AlterField(
+            model_name='projectfile',
+            name='file',
+            field=models.FileField(storage=projects.storage.blob_storage, upload_to='project_files/'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Full-text index for projects/search.py, maintained by the database itself.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE projects_project_fts USING fts5(
+        title, description, content='projects_project', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER projects_project_fts_insert AFTER INSERT ON projects_project BEGIN
+        INSERT INTO projects_project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER projects_project_fts_delete AFTER DELETE ON projects_project BEGIN
+        INSERT INTO projects_project_fts(projects_project_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER projects_project_fts_update AFTER UPDATE OF title, description ON projects_project BEGIN
+        INSERT INTO projects_project_fts(projects_project_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO projects_project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO projects_project_fts(projects_project_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS projects_project_fts_update",
+    "DROP TRIGGER IF EXISTS projects_project_fts_delete",
+    "DROP TRIGGER IF EXISTS projects_project_fts_insert",
+    "DROP TABLE IF EXISTS projects_project_fts",
+]
+
+POSTGRES_FORWARD = [
+    """ALTER TABLE projects_project ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX projects_project_search_idx ON projects_project USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS projects_project_search_idx",
+    "ALTER TABLE projects_project DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0016_project_tombstone'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
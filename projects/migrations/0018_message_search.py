@@ -0,0 +1,62 @@
+# Full-text index over chat messages for projects/search.py, maintained by the database itself.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    # project_id is indexed as a token so a search can be scoped to one project cheaply
+    """CREATE VIRTUAL TABLE projects_projectmessage_fts USING fts5(
+        content, project_id, content='projects_projectmessage', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER projects_projectmessage_fts_insert AFTER INSERT ON projects_projectmessage BEGIN
+        INSERT INTO projects_projectmessage_fts(rowid, content, project_id)
+        VALUES (new.id, new.content, new.project_id);
+    END""",
+    """CREATE TRIGGER projects_projectmessage_fts_delete AFTER DELETE ON projects_projectmessage BEGIN
+        INSERT INTO projects_projectmessage_fts(projects_projectmessage_fts, rowid, content, project_id)
+        VALUES ('delete', old.id, old.content, old.project_id);
+    END""",
+    """CREATE TRIGGER projects_projectmessage_fts_update AFTER UPDATE OF content, project_id ON projects_projectmessage BEGIN
+        INSERT INTO projects_projectmessage_fts(projects_projectmessage_fts, rowid, content, project_id)
+        VALUES ('delete', old.id, old.content, old.project_id);
+        INSERT INTO projects_projectmessage_fts(rowid, content, project_id)
+        VALUES (new.id, new.content, new.project_id);
+    END""",
+    "INSERT INTO projects_projectmessage_fts(projects_projectmessage_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS projects_projectmessage_fts_update",
+    "DROP TRIGGER IF EXISTS projects_projectmessage_fts_delete",
+    "DROP TRIGGER IF EXISTS projects_projectmessage_fts_insert",
+    "DROP TABLE IF EXISTS projects_projectmessage_fts",
+]
+
+POSTGRES_FORWARD = [
+    """ALTER TABLE projects_projectmessage ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED""",
+    "CREATE INDEX projects_projectmessage_search_idx ON projects_projectmessage USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS projects_projectmessage_search_idx",
+    "ALTER TABLE projects_projectmessage DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0017_project_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_masks(apps, schema_editor):
+    # Number every tag in use, then pack each project's and user's tags
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    SkillBit = apps.get_model('projects', 'SkillBit')
+
+    tag_ids = TaggedItem.objects.values_list('tag_id', flat=True).distinct().order_by('tag_id')
+    SkillBit.objects.bulk_create([SkillBit(tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True)
+    bits = {tag_id: pk - 1 for tag_id, pk in SkillBit.objects.values_list('tag_id', 'id')}
+
+    for app_label, model_name in (('projects', 'project'), ('users', 'user')):
+        content_type = ContentType.objects.filter(app_label=app_label, model=model_name).first()
+        if content_type is None:
+            continue
+        masks = {}
+        items = TaggedItem.objects.filter(content_type=content_type).values_list('object_id', 'tag_id')
+        for object_id, tag_id in items.iterator(chunk_size=5000):
+            masks[object_id] = masks.get(object_id, 0) | 1 << bits[tag_id]
+        model = apps.get_model(app_label, model_name)
+        for object_id, mask in masks.items():
+            model._base_manager.filter(pk=object_id).update(
+                skill_mask=mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0018_message_search'),
+        ('users', '0005_skill_mask'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='skill_mask',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.CreateModel(
+            name='SkillBit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='skill_bit', to='taggit.tag')),
+            ],
+        ),
+        migrations.RunPython(backfill_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0020_image_variant_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamRecommendation',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='team_recommendation', serialize=False, to='projects.project')),
+                ('users', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -1,19 +1,41 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
 from taggit.managers import TaggableManager
 
+from .images import srcset
+from .storage import blob_storage
+
+class LiveProjectManager(models.Manager):
+    # Projects waiting for the deletion worker (see deletion.py) are hidden everywhere
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Project(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='owned_projects', on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
     description = models.TextField()
     required_skills = TaggableManager() 
     created_at = models.DateTimeField(auto_now_add=True)
-    thumbnail = models.ImageField(upload_to='project_thumbnails/', blank=True, null=True)
+    thumbnail = models.ImageField(upload_to='project_thumbnails/', storage=blob_storage, blank=True, null=True)
+    # {"name": <thumbnail it was made from>, "widths": [...]}, filled in by images.py
+    thumbnail_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Members (Active Team) and Requests (Waiting List)
     members = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='joined_projects', blank=True)
     join_requests = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='pending_requests', blank=True)
 
+    # Bumped on every Task create/update/delete so board polls can skip re-rendering
+    board_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Packed bitset of required_skills over SkillBit ids (see skills.py), kept in sync by signals
+    skill_mask = models.BinaryField(default=b'', editable=False)
+
+    # Tombstone: set when the owner deletes the project, before the rows are purged
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True, editable=False)
+
     # Optional Gemini API Key for AI task generation
     gemini_api_key = models.CharField(
         max_length=255, 
@@ -22,13 +44,37 @@ class Project(models.Model):
         help_text="Optional: Enter your Gemini API Key to enable AI task generation."
     )
 
+    objects = LiveProjectManager()
+    all_objects = models.Manager()
+
+    # Columns only ever written with queryset.update() (F() counters, signal
+    # and worker bookkeeping). A full save() would write back the value it
+    # loaded and undo a concurrent update, so only an explicit update_fields
+    # may touch them.
+    UPDATE_ONLY_FIELDS = ('board_version', 'skill_mask', 'thumbnail_variants', 'deleted_at')
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.UPDATE_ONLY_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def thumbnail_srcset(self):
+        return srcset(self.thumbnail, self.thumbnail_variants, 'card')
+
 class ProjectFile(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='files')
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    file = models.FileField(upload_to='project_files/')
+    file = models.FileField(upload_to='project_files/', storage=blob_storage)
     
     # This field stores the custom "Display Name" the user enters during upload
     name = models.CharField(max_length=255) 
@@ -36,12 +82,124 @@ class ProjectFile(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.project.title})"
-    
+
+
+class StoredBlob(models.Model):
+    # Reference count per content-addressed blob (see storage.py)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField(default=0)
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} x{self.refcount}"
+
+
+class ImageVariantJob(models.Model):
+    # An image waiting for its resized variants (see images.py); drained by
+    # the run_image_worker command. One row per image-holding row.
+    model = models.CharField(max_length=100)  # e.g. "projects.project"
+    object_id = models.BigIntegerField()
+    # The image the row held when queued; a newer upload re-points the job
+    name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'object_id'], name='unique_image_variant_job'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}:{self.object_id} {self.name}"
+
+
+class UploadSession(models.Model):
+    # An in-progress chunked upload (see uploads.py). Bytes land in a
+    # partial file on disk; only a finalized upload becomes a ProjectFile.
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='upload_sessions')
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    name = models.CharField(max_length=255)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename}: {self.received}/{self.total_size}"
+
 class ProjectMessage(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='messages')
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Backs the chat "since last id" cursor: WHERE project_id = ? AND id > ?
+        indexes = [
+            models.Index(fields=['project', 'id'], name='projectmessage_cursor_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.sender.username}: {self.content[:20]}"
+
+
+class ProjectSkillIndex(models.Model):
+    # Inverted index: one row per (skill tag, project). Lets matchmaking
+    # score only the projects that share a user's skills instead of
+    # joining taggit's generic TaggedItem table for every project.
+    tag = models.ForeignKey('taggit.Tag', on_delete=models.CASCADE, related_name='project_index')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='skill_index')
+
+    # Copied from Project.created_at so ties are broken without a join
+    project_created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'project'], name='unique_project_skill'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'project_created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.tag_id} -> {self.project_id}"
+
+
+class SkillBit(models.Model):
+    # Compact skill vocabulary: bit ``id - 1`` of every skill_mask stands
+    # for this tag. Ids come from the sequence, so they stay dense.
+    tag = models.OneToOneField('taggit.Tag', on_delete=models.CASCADE, related_name='skill_bit')
+
+    def __str__(self):
+        return f"bit {self.id - 1} = {self.tag_id}"
+
+
+class TeamRecommendation(models.Model):
+    # Precomputed teammate suggestions of one project (see recommendations.py),
+    # shared by every web process; deleted when the team or its skills change.
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='team_recommendation')
+    # [[user_id, [gap tag ids the user covers]], ...], best first
+    users = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.project_id}: {len(self.users)} suggestions"
+
+
+class RealtimeEvent(models.Model):
+    # Short-lived event rows used by realtime.DatabaseBroker to fan events
+    # out across worker processes. manage.py prune_realtime_events removes
+    # rows older than a few minutes.
+    channel = models.CharField(max_length=64)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['channel', 'id']),
+        ]
+
     def __str__(self):
-        return f"{self.sender.username}: {self.content[:20]}"
\ No newline at end of file
+        return f"{self.channel}: {self.payload}"
@@ -0,0 +1,177 @@
+# projects/realtime.py
+# Pub/sub layer behind the per-project server-sent events stream.
+#
+# Views publish small "something changed" events (a new chat message, a task
+# status change); every open stream for that project receives them and the
+# page fetches the actual data with its normal htmx request. The broker is
+# chosen with settings.REALTIME_BROKER:
+#   - InMemoryBroker (default): single process, zero setup.
+#   - DatabaseBroker: events go through a table, so publishers and streams
+#     may live in different worker processes. A local stand-in for Redis.
+#     Old rows are removed by manage.py prune_realtime_events.
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+# How long a subscriber waits before the stream sends a keep-alive comment
+KEEPALIVE_SECONDS = getattr(settings, 'REALTIME_KEEPALIVE_SECONDS', 15)
+# DatabaseBroker rows older than this are deleted by prune_realtime_events
+REALTIME_EVENT_RETENTION = getattr(settings, 'REALTIME_EVENT_RETENTION', timedelta(minutes=5))
+
+
+def channel_for(project_id):
+    return f'project-{project_id}'
+
+
+# --- 1. BROKERS ---
+class BaseBroker:
+    """Interface every broker implements.
+
+    ``publish`` is synchronous and may be called from any thread.
+    ``subscribe`` returns a Subscription whose ``get`` is awaited by the stream.
+    """
+
+    def publish(self, channel, event):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseBroker):
+    # Slow readers drop events instead of growing the queue forever; events
+    # are only nudges to refetch, so one missed nudge is harmless.
+    max_queue = 100
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.offer, event)
+
+    def subscribe(self, channel):
+        subscription = _QueueSubscription(self, channel)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+class _QueueSubscription:
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=broker.max_queue)
+
+    def offer(self, event):
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker._unsubscribe(self)
+
+
+class DatabaseBroker(InMemoryBroker):
+    # One poller thread per process tails the RealtimeEvent table by id for
+    # every channel that has a local subscriber, and fans new rows out to the
+    # in-memory queues; the query count does not grow with open streams.
+    poll_interval = 1.0
+
+    def __init__(self):
+        super().__init__()
+        self._poller = None
+
+    def publish(self, channel, event):
+        from .models import RealtimeEvent
+
+        # Local subscribers get it from the poller too, like everyone else
+        RealtimeEvent.objects.create(channel=channel, payload=event)
+
+    def subscribe(self, channel):
+        subscription = super().subscribe(channel)
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name='realtime-poller', daemon=True)
+                self._poller.start()
+        return subscription
+
+    def _poll(self):
+        from .models import RealtimeEvent
+
+        last_id = None
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                channels = list(self._subscribers)
+            if not channels:
+                continue
+            try:
+                if last_id is None:
+                    # Start from "now": only events published after subscribing count
+                    last_id = RealtimeEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+                rows = list(
+                    RealtimeEvent.objects.filter(id__gt=last_id, channel__in=channels)
+                    .order_by('id').values_list('id', 'channel', 'payload')
+                )
+            except DatabaseError:
+                # Reconnect on the next tick
+                connection.close()
+                continue
+            for row_id, channel, payload in rows:
+                last_id = row_id
+                super().publish(channel, payload)
+
+
+def prune_events(older_than=REALTIME_EVENT_RETENTION):
+    """Delete DatabaseBroker rows older than ``older_than``. Returns the count."""
+    from .models import RealtimeEvent
+
+    deleted, _ = RealtimeEvent.objects.filter(created_at__lt=timezone.now() - older_than).delete()
+    return deleted
+
+
+# --- 2. PUBLIC HELPERS ---
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.REALTIME_BROKER)()
+    return _broker
+
+
+def publish(project_id, kind, **data):
+    """Announce a change on a project once the current transaction commits."""
+    if not settings.REALTIME_ENABLED:
+        return
+    event = {'kind': kind, **data}
+    transaction.on_commit(lambda: get_broker().publish(channel_for(project_id), event))
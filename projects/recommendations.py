@@ -0,0 +1,151 @@
+# projects/recommendations.py
+# Suggested teammates for a project owner.
+#
+# A project's "gap" is the set of required_skills that neither the owner nor
+# any member has. Candidates are users holding at least one gap skill, found
+# through taggit's TaggedItem tag index (never a scan of the user table), and
+# capped at TEAM_RECOMMEND_CANDIDATES by how many gap skills they hold. The
+# suggestions are then picked greedily, as for set cover: each pick is the
+# candidate covering the most still-uncovered gap skills (a popcount over the
+# skill bitsets, see skills.py).
+#
+# The lists are precomputed by manage.py refresh_team_recommendations into
+# TeamRecommendation rows, which every web process reads with one primary
+# key lookup. A project without a row (or with one older than
+# TEAM_RECOMMEND_MAX_AGE) is computed on first view. Team and skill changes
+# delete the project's row (signals.py).
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
+from django.utils import timezone
+from taggit.models import Tag, TaggedItem
+
+from .models import Project, TeamRecommendation
+from .skills import decode_mask, skill_bits
+
+TEAM_RECOMMEND_LIMIT = getattr(settings, 'TEAM_RECOMMEND_LIMIT', 6)
+TEAM_RECOMMEND_CANDIDATES = getattr(settings, 'TEAM_RECOMMEND_CANDIDATES', 2000)
+# The batch job refreshes every list well before this; user skill edits show up then
+TEAM_RECOMMEND_MAX_AGE = getattr(settings, 'TEAM_RECOMMEND_MAX_AGE', 60 * 60 * 24)
+
+
+def forget_recommendations(project_id):
+    TeamRecommendation.objects.filter(project_id=project_id).delete()
+
+
+# --- 1. GREEDY COVER ---
+def greedy_cover(gap, candidates, limit=TEAM_RECOMMEND_LIMIT):
+    """Pick up to ``limit`` of ``{user_id: mask}`` to cover ``gap``: ``[(user_id, gained_mask), ...]``.
+
+    Each pick covers the most still-uncovered bits (ties: lower user id).
+    Once nothing new can be covered, the rest are ranked by overlap with
+    ``gap``. ``gained_mask`` is every gap bit the user holds.
+    """
+    uncovered = gap
+    remaining = dict(candidates)
+    picks = []
+    while remaining and len(picks) < limit:
+        target = uncovered or gap
+        user_id = max(remaining, key=lambda pk: ((remaining[pk] & target).bit_count(), -pk))
+        if not remaining[user_id] & target:
+            if target == gap:
+                break
+            uncovered = 0
+            continue
+        held = remaining.pop(user_id) & gap
+        picks.append((user_id, held))
+        uncovered &= ~held
+    return picks
+
+
+# --- 2. COMPUTING ---
+def team_user_ids(project):
+    return {project.owner_id, *project.members.values_list('id', flat=True)}
+
+
+def compute_recommendations(project, limit=TEAM_RECOMMEND_LIMIT):
+    """``[(user_id, [tag_id, ...]), ...]``: suggested teammates and the gap skills each covers."""
+    User = get_user_model()
+    required = list(project.required_skills.values_list('id', flat=True))
+    if not required:
+        return []
+
+    team = team_user_ids(project)
+    team_mask = 0
+    for mask in User.objects.filter(id__in=team).values_list('skill_mask', flat=True):
+        team_mask |= decode_mask(mask)
+    bits = skill_bits(required)
+    gap_tags = [tag_id for tag_id, bit in bits.items() if not team_mask >> bit & 1]
+    if not gap_tags:
+        return []
+
+    # Users with the most gap skills first; Count() runs over the tag index only
+    excluded = team | set(project.join_requests.values_list('id', flat=True))
+    candidate_ids = [
+        object_id for object_id in (
+            TaggedItem.objects.filter(content_type=ContentType.objects.get_for_model(User), tag_id__in=gap_tags)
+            .values('object_id').annotate(held=Count('id'))
+            .order_by('-held', 'object_id').values_list('object_id', flat=True)
+            [:TEAM_RECOMMEND_CANDIDATES + len(excluded)]
+        )
+        if object_id not in excluded
+    ][:TEAM_RECOMMEND_CANDIDATES]
+    candidates = {
+        user_id: decode_mask(mask)
+        for user_id, mask in User.objects.filter(id__in=candidate_ids, is_active=True).values_list('id', 'skill_mask')
+    }
+
+    gap = 0
+    for tag_id in gap_tags:
+        gap |= 1 << bits[tag_id]
+    return [
+        (user_id, [tag_id for tag_id in gap_tags if gained >> bits[tag_id] & 1])
+        for user_id, gained in greedy_cover(gap, candidates, limit)
+    ]
+
+
+def refresh_recommendations(project):
+    recommendations = compute_recommendations(project)
+    TeamRecommendation.objects.bulk_create(
+        [TeamRecommendation(project_id=project.pk, users=recommendations, computed_at=timezone.now())],
+        update_conflicts=True, unique_fields=['project'], update_fields=['users', 'computed_at'],
+    )
+    return recommendations
+
+
+def refresh_all(chunk_size=500):
+    """Batch job: recompute and store the suggestions of every live project. Returns the count."""
+    total = 0
+    for project in Project.objects.only('id', 'owner_id').iterator(chunk_size=chunk_size):
+        refresh_recommendations(project)
+        total += 1
+    return total
+
+
+# --- 3. SERVING ---
+def recommended_teammates(project):
+    """Suggested users for ``project``'s owner, each with ``covers_skills`` (tag names) set."""
+    stored = TeamRecommendation.objects.filter(
+        project_id=project.pk, computed_at__gte=timezone.now() - timedelta(seconds=TEAM_RECOMMEND_MAX_AGE)
+    ).values_list('users', flat=True).first()
+    recommendations = refresh_recommendations(project) if stored is None else stored
+    if not recommendations:
+        return []
+
+    # The stored list may predate a join; drop anyone already on the team
+    team = team_user_ids(project) | set(project.join_requests.values_list('id', flat=True))
+    users = get_user_model().objects.in_bulk([user_id for user_id, _ in recommendations if user_id not in team])
+    names = dict(Tag.objects.filter(
+        id__in={tag_id for _, tag_ids in recommendations for tag_id in tag_ids}
+    ).values_list('id', 'name'))
+
+    suggested = []
+    for user_id, tag_ids in recommendations:
+        user = users.get(user_id)
+        if user is not None:
+            user.covers_skills = [names[tag_id] for tag_id in tag_ids if tag_id in names]
+            suggested.append(user)
+    return suggested
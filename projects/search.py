@@ -0,0 +1,278 @@
+# projects/search.py
+# Keyword search over Project.title/description and ProjectMessage.content.
+#
+# The text indexes live in the database and are kept current by the database
+# itself on every INSERT/UPDATE/DELETE (see migrations 0017_project_search
+# and 0018_message_search):
+#   - SQLiteSearchBackend:   FTS5 tables kept in sync by triggers, bm25 ranking.
+#   - PostgresSearchBackend: generated tsvector columns with GIN indexes, ts_rank_cd.
+#   - BasicSearchBackend:    icontains scan, for any other database.
+# settings.SEARCH_BACKEND picks one. search_projects() blends the text rank
+# with how many of the user's skills each hit needs.
+import re
+import threading
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+from .models import Project, ProjectMessage
+from .skills import decode_mask
+
+# Text hits considered per query, before blending in skill matches
+SEARCH_MAX_RESULTS = getattr(settings, 'SEARCH_MAX_RESULTS', 200)
+# A hit needing all of the user's skills gains this much over the best text match
+SEARCH_SKILL_WEIGHT = getattr(settings, 'SEARCH_SKILL_WEIGHT', 0.5)
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_MAX_TERMS = 16
+# Highlight markers the databases wrap matches in; swapped for <mark> after escaping
+_HIT_START, _HIT_END = '\x02', '\x03'
+_SNIPPET_WORDS = 16
+
+
+def search_terms(query):
+    return _WORD_RE.findall(query.lower())[:_MAX_TERMS]
+
+
+def snippet_html(marked):
+    """HTML for a snippet with highlight markers: user text escaped, matches in <mark>."""
+    html = escape(marked).replace(_HIT_START, '<mark>').replace(_HIT_END, '</mark>')
+    return mark_safe(html)
+
+
+# --- 1. BACKENDS ---
+class BaseSearchBackend:
+    """Interface every search backend implements."""
+
+    def search(self, query, limit):
+        """``[(project_id, score), ...]`` best first; higher scores are better."""
+        raise NotImplementedError
+
+    def search_messages(self, project_id, query, before, limit):
+        """``[(message_id, marked_snippet), ...]`` newest first, ids below ``before`` when given."""
+        raise NotImplementedError
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    # Title matches weigh ten times a description match
+    sql = '''
+        SELECT f.rowid, bm25(projects_project_fts, 10.0, 1.0) AS score
+        FROM projects_project_fts f
+        JOIN projects_project p ON p.id = f.rowid
+        WHERE projects_project_fts MATCH %s AND p.deleted_at IS NULL
+        ORDER BY score, f.rowid DESC
+        LIMIT %s
+    '''
+
+    @staticmethod
+    def match_expression(query):
+        # Every term must appear; quoting keeps user input out of the FTS5
+        # query syntax, and the last term also matches as a prefix
+        terms = [f'"{term}"' for term in search_terms(query)]
+        if terms:
+            terms[-1] += '*'
+        return ' '.join(terms)
+
+    # The project id is an indexed column too, so FTS5 intersects the two
+    # term lists instead of filtering every match in the table
+    message_sql = '''
+        SELECT rowid, snippet(projects_projectmessage_fts, 0, %s, %s, '…', %s)
+        FROM projects_projectmessage_fts
+        WHERE projects_projectmessage_fts MATCH %s AND rowid < %s
+        ORDER BY rowid DESC
+        LIMIT %s
+    '''
+
+    def search(self, query, limit):
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(self.sql, [expression, limit])
+            # bm25() is lower-is-better
+            return [(project_id, -score) for project_id, score in cursor.fetchall()]
+
+    def search_messages(self, project_id, query, before, limit):
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        match = f'project_id:"{int(project_id)}" AND content:({expression})'
+        with connection.cursor() as cursor:
+            cursor.execute(self.message_sql, [
+                _HIT_START, _HIT_END, _SNIPPET_WORDS, match, before or 2 ** 63 - 1, limit,
+            ])
+            return cursor.fetchall()
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    # Normalization 32 maps the rank into 0..1
+    sql = '''
+        SELECT p.id, ts_rank_cd(p.search_vector, query, 32) AS score
+        FROM projects_project p, websearch_to_tsquery('english', %s) query
+        WHERE p.search_vector @@ query AND p.deleted_at IS NULL
+        ORDER BY score DESC, p.id DESC
+        LIMIT %s
+    '''
+
+    # Seeks the (project, id) index backwards and checks each row against the
+    # query; a rare term is found through the GIN index instead
+    message_sql = '''
+        SELECT m.id, ts_headline('english', m.content, query, %s)
+        FROM projects_projectmessage m, websearch_to_tsquery('english', %s) query
+        WHERE m.project_id = %s AND m.search_vector @@ query AND m.id < %s
+        ORDER BY m.id DESC
+        LIMIT %s
+    '''
+
+    def search(self, query, limit):
+        if not search_terms(query):
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(self.sql, [query, limit])
+            return cursor.fetchall()
+
+    def search_messages(self, project_id, query, before, limit):
+        if not search_terms(query):
+            return []
+        options = f'StartSel={_HIT_START}, StopSel={_HIT_END}, MaxWords={_SNIPPET_WORDS}, MinWords=5'
+        with connection.cursor() as cursor:
+            cursor.execute(self.message_sql, [options, query, project_id, before or 2 ** 63 - 1, limit])
+            return cursor.fetchall()
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    def search(self, query, limit):
+        terms = search_terms(query)
+        if not terms:
+            return []
+        matches = Q()
+        for term in terms:
+            matches &= Q(title__icontains=term) | Q(description__icontains=term)
+        rows = Project.objects.filter(matches).order_by('-created_at').values_list('id', 'title')[:limit]
+        hits = [(project_id, 1.0 + sum(term in title.lower() for term in terms)) for project_id, title in rows]
+        return sorted(hits, key=lambda hit: -hit[1])
+
+    def search_messages(self, project_id, query, before, limit):
+        terms = search_terms(query)
+        if not terms:
+            return []
+        rows = ProjectMessage.objects.filter(project_id=project_id)
+        if before:
+            rows = rows.filter(id__lt=before)
+        for term in terms:
+            rows = rows.filter(content__icontains=term)
+        pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+        return [
+            (message_id, pattern.sub(lambda hit: f'{_HIT_START}{hit.group()}{_HIT_END}', content))
+            for message_id, content in rows.order_by('-id').values_list('id', 'content')[:limit]
+        ]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(settings.SEARCH_BACKEND)()
+    return _backend
+
+
+# --- 2. RANKING ---
+def search_projects(user, query):
+    """Rank projects for ``query``: ``[(project_id, match_count), ...]``, best first.
+
+    Text scores are scaled so the best hit is 1.0, then each hit gains
+    SEARCH_SKILL_WEIGHT times the share of the user's skills it requires.
+    """
+    hits = get_backend().search(query, SEARCH_MAX_RESULTS)
+    if not hits:
+        return []
+
+    best = max(score for _, score in hits) or 1.0
+    user_mask = decode_mask(user.skill_mask) if user.is_authenticated else 0
+    skill_total = user_mask.bit_count()
+    matches = {}
+    if user_mask:
+        masks = Project.objects.filter(id__in=[pk for pk, _ in hits]).values_list('id', 'skill_mask')
+        matches = {project_id: (user_mask & decode_mask(mask)).bit_count() for project_id, mask in masks}
+
+    def blended(hit):
+        project_id, score = hit
+        skill_share = matches.get(project_id, 0) / skill_total if skill_total else 0.0
+        return score / best + SEARCH_SKILL_WEIGHT * skill_share
+
+    ranked = sorted(hits, key=blended, reverse=True)
+    return [(project_id, matches.get(project_id, 0)) for project_id, _ in ranked]
+
+
+# --- 3. INDEX UPKEEP ---
+# SQLite rebuilds a table to alter most columns, which silently drops its
+# triggers; post_migrate puts them back (see signals.py).
+SQLITE_TRIGGERS = {
+    'projects_project_fts': {
+        'projects_project_fts_insert': """
+            CREATE TRIGGER projects_project_fts_insert AFTER INSERT ON projects_project BEGIN
+                INSERT INTO projects_project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END""",
+        'projects_project_fts_delete': """
+            CREATE TRIGGER projects_project_fts_delete AFTER DELETE ON projects_project BEGIN
+                INSERT INTO projects_project_fts(projects_project_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END""",
+        'projects_project_fts_update': """
+            CREATE TRIGGER projects_project_fts_update AFTER UPDATE OF title, description ON projects_project BEGIN
+                INSERT INTO projects_project_fts(projects_project_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO projects_project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END""",
+    },
+    'projects_projectmessage_fts': {
+        'projects_projectmessage_fts_insert': """
+            CREATE TRIGGER projects_projectmessage_fts_insert AFTER INSERT ON projects_projectmessage BEGIN
+                INSERT INTO projects_projectmessage_fts(rowid, content, project_id)
+                VALUES (new.id, new.content, new.project_id);
+            END""",
+        'projects_projectmessage_fts_delete': """
+            CREATE TRIGGER projects_projectmessage_fts_delete AFTER DELETE ON projects_projectmessage BEGIN
+                INSERT INTO projects_projectmessage_fts(projects_projectmessage_fts, rowid, content, project_id)
+                VALUES ('delete', old.id, old.content, old.project_id);
+            END""",
+        'projects_projectmessage_fts_update': """
+            CREATE TRIGGER projects_projectmessage_fts_update AFTER UPDATE OF content, project_id ON projects_projectmessage BEGIN
+                INSERT INTO projects_projectmessage_fts(projects_projectmessage_fts, rowid, content, project_id)
+                VALUES ('delete', old.id, old.content, old.project_id);
+                INSERT INTO projects_projectmessage_fts(rowid, content, project_id)
+                VALUES (new.id, new.content, new.project_id);
+            END""",
+    },
+}
+
+
+def repair_sqlite_index(using='default'):
+    """Recreate missing FTS5 triggers and reindex. Returns True if anything was missing."""
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return False
+    repaired = False
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE 'projects_%_fts%'")
+        existing = {name for (name,) in cursor.fetchall()}
+        for table, triggers in SQLITE_TRIGGERS.items():
+            if table not in existing:
+                # Not migrated that far yet
+                continue
+            missing = [name for name in triggers if name not in existing]
+            for name in missing:
+                cursor.execute(triggers[name])
+            if missing:
+                cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+                repaired = True
+    return repaired
@@ -0,0 +1,108 @@
+# projects/signals.py
+# Keeps the matchmaking skill index and skill bitsets in sync with taggit
+# changes, drops stale teammate suggestions, releases replaced or deleted
+# media blobs, and schedules resized variants of newly saved images.
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from users.models import User
+from .images import schedule_variants
+from .matching import (
+    bump_index_version, forget_user_ranking, index_project_skills, unindex_project_skills
+)
+from .models import Project, ProjectFile
+from .recommendations import forget_recommendations
+from .search import repair_sqlite_index
+from .skills import bump_skill_index, update_skill_mask
+from .storage import file_fields, release_deleted, release_replaced, remember_stored_name
+
+# model -> its blob_storage file field
+_BLOB_FIELDS = dict(file_fields())
+
+
+# Project.required_skills and User.skills share taggit's TaggedItem through model,
+# so one receiver handles both and dispatches on the instance type.
+@receiver(m2m_changed, sender=TaggedItem)
+def skills_changed(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if isinstance(instance, Project):
+        # Mask first: the index calls bump the version that drops cached rankings
+        update_skill_mask(instance, instance.required_skills)
+        forget_recommendations(instance.pk)
+        if action == 'post_add':
+            index_project_skills(instance, pk_set)
+        elif action == 'post_remove':
+            unindex_project_skills(instance, pk_set)
+        else:
+            unindex_project_skills(instance)
+    elif isinstance(instance, User):
+        update_skill_mask(instance, instance.skills)
+        forget_user_ranking(instance.pk)
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+@receiver(m2m_changed, sender=Project.join_requests.through)
+def team_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # The team's skill gap (or who is already asking to join) moved
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        forget_recommendations(instance.pk)
+    elif pk_set:
+        for project_id in pk_set:
+            forget_recommendations(project_id)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    # Index rows go with the cascade; cached rankings still hold the old id
+    bump_index_version()
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=ProjectFile)
+@receiver(pre_save, sender=User)
+def blob_saving(sender, instance, update_fields=None, **kwargs):
+    remember_stored_name(instance, _BLOB_FIELDS[sender], update_fields)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=ProjectFile)
+@receiver(post_save, sender=User)
+def blob_saved(sender, instance, **kwargs):
+    release_replaced(instance, _BLOB_FIELDS[sender])
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=ProjectFile)
+@receiver(post_delete, sender=User)
+def blob_owner_deleted(sender, instance, **kwargs):
+    release_deleted(instance, _BLOB_FIELDS[sender])
+
+
+@receiver(post_save, sender=Project)
+def thumbnail_saved(sender, instance, **kwargs):
+    schedule_variants(instance, 'thumbnail', 'thumbnail_variants', 'card')
+
+
+@receiver(post_save, sender=User)
+def profile_picture_saved(sender, instance, **kwargs):
+    schedule_variants(instance, 'profile_picture', 'profile_picture_variants', 'avatar')
+
+
+@receiver(post_migrate, sender=apps.get_app_config('projects'))
+def search_index_migrated(sender, using, **kwargs):
+    repair_sqlite_index(using)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_changed(sender, instance, created=True, **kwargs):
+    # New and removed tags show up in autocomplete right away; renames and
+    # usage counts wait for the index TTL
+    if created:
+        bump_skill_index()
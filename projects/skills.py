@@ -0,0 +1,137 @@
+# projects/skills.py
+# Skill tags: autocomplete answered from memory, and packed skill bitsets.
+#
+# --- Autocomplete ---
+# Every taggit Tag name (and each later word in it, so "stu" finds
+# "Android Studio") goes into a sorted array; a prefix lookup is a bisect
+# followed by a short scan, and the most used tags win. The array is built
+# lazily per process and rebuilt when a tag is created or deleted (a cache
+# version bump, as for matchmaking rankings) or after SKILL_INDEX_TTL, so
+# usage counts stay roughly current. No keystroke touches the database.
+#
+# --- Bitsets ---
+# SkillBit numbers every tag that is in use; Project.skill_mask and
+# User.skill_mask hold the set bits of their tags, so skill overlap is
+# ``(a & b).bit_count()``. The m2m signals keep the masks current.
+import heapq
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from taggit.models import Tag
+
+from .models import SkillBit
+
+SKILL_AUTOCOMPLETE_LIMIT = getattr(settings, 'SKILL_AUTOCOMPLETE_LIMIT', 10)
+SKILL_INDEX_TTL = getattr(settings, 'SKILL_INDEX_TTL', 300)
+
+_VERSION_KEY = 'skills:index-version'
+
+
+class PrefixIndex:
+    """Sorted ``(key, tag)`` pairs over lower-cased names and their word starts."""
+
+    def __init__(self, tags):
+        self.names = []
+        self.counts = []
+        pairs = []
+        for name, count in tags:
+            position = len(self.names)
+            self.names.append(name)
+            self.counts.append(count)
+            words = name.casefold().split()
+            pairs.extend((' '.join(words[start:]), position) for start in range(len(words)))
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._positions = [position for _, position in pairs]
+
+    def __len__(self):
+        return len(self.names)
+
+    def complete(self, prefix, limit=SKILL_AUTOCOMPLETE_LIMIT):
+        """``[(name, usage_count), ...]`` for tags starting with ``prefix``, most used first."""
+        prefix = ' '.join(prefix.casefold().split())
+        if not prefix:
+            return []
+        found = set()
+        index = bisect_left(self._keys, prefix)
+        while index < len(self._keys) and self._keys[index].startswith(prefix):
+            found.add(self._positions[index])
+            index += 1
+        best = heapq.nsmallest(limit, found, key=lambda position: (-self.counts[position], self.names[position]))
+        return [(self.names[position], self.counts[position]) for position in best]
+
+
+# --- PER-PROCESS INDEX ---
+_index = None
+_index_version = None
+_index_built = 0.0
+_lock = threading.Lock()
+
+
+def bump_skill_index():
+    """Make every process rebuild its index on the next lookup."""
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 1, None)
+
+
+def build_index():
+    tags = Tag.objects.annotate(uses=Count('taggit_taggeditem_items')).values_list('name', 'uses')
+    return PrefixIndex(tags.iterator(chunk_size=2000))
+
+
+def get_index():
+    global _index, _index_version, _index_built
+    version = cache.get_or_set(_VERSION_KEY, 1, None)
+    if _index is None or version != _index_version or time.monotonic() - _index_built > SKILL_INDEX_TTL:
+        with _lock:
+            if _index is None or version != _index_version or time.monotonic() - _index_built > SKILL_INDEX_TTL:
+                _index = build_index()
+                _index_version = version
+                _index_built = time.monotonic()
+    return _index
+
+
+def complete_skill(prefix, limit=SKILL_AUTOCOMPLETE_LIMIT):
+    return get_index().complete(prefix, limit)
+
+
+# --- BITSETS ---
+def encode_mask(mask):
+    return mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+
+
+def decode_mask(data):
+    return int.from_bytes(bytes(data or b''), 'little')
+
+
+def skill_bits(tag_ids):
+    """``{tag_id: bit}``, numbering tags seen for the first time."""
+    tag_ids = set(tag_ids)
+    bits = dict(SkillBit.objects.filter(tag_id__in=tag_ids).values_list('tag_id', 'id'))
+    missing = tag_ids - bits.keys()
+    if missing:
+        SkillBit.objects.bulk_create([SkillBit(tag_id=tag_id) for tag_id in missing], ignore_conflicts=True)
+        bits.update(SkillBit.objects.filter(tag_id__in=missing).values_list('tag_id', 'id'))
+    return {tag_id: pk - 1 for tag_id, pk in bits.items()}
+
+
+def mask_for(tag_ids):
+    mask = 0
+    for bit in skill_bits(tag_ids).values():
+        mask |= 1 << bit
+    return mask
+
+
+def update_skill_mask(instance, tags):
+    """Recompute and store ``instance.skill_mask`` from its ``tags`` manager. Returns the mask."""
+    mask = mask_for(tags.values_list('id', flat=True))
+    instance.skill_mask = encode_mask(mask)
+    # update() so post_save handlers don't run again
+    type(instance)._base_manager.filter(pk=instance.pk).update(skill_mask=instance.skill_mask)
+    return mask
@@ -0,0 +1,189 @@
+# projects/storage.py
+# Content-addressed, deduplicated media storage.
+#
+# A saved file is named after the SHA-256 of its bytes and fanned out into
+# two levels of 256 directories:
+#     blobs/9f/86/9f86d081884c7d65...0f00a08.png
+# so no directory ever grows past a few dozen entries, even at millions of
+# files. Identical uploads share one blob; StoredBlob counts the references
+# and the bytes are only removed when the last one is released, whether the
+# row was deleted or its file replaced.
+# Files saved before this backend existed keep their old names and are
+# handled like plain FileSystemStorage files (see manage.py rebuild_blob_index).
+import hashlib
+import os
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+BLOB_ROOT = 'blobs'
+_COPY_BLOCK = 64 * 1024
+
+
+def blob_name(digest, ext=''):
+    return f'{BLOB_ROOT}/{digest[:2]}/{digest[2:4]}/{digest}{ext.lower()}'
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(BLOB_ROOT + '/')
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is only known once the content is hashed (in _save),
+        # and an existing name there is the same bytes, not a clash
+        return name
+
+    def _save(self, name, content):
+        from .models import StoredBlob
+
+        ext = os.path.splitext(name)[1][:16]
+        temp_dir = self.path(os.path.join(BLOB_ROOT, 'tmp'))
+        os.makedirs(temp_dir, exist_ok=True)
+
+        # Hash while writing to a temp file in the same filesystem, so the
+        # final step is a cheap rename; a file already on disk is moved, not copied
+        digest = hashlib.sha256()
+        if hasattr(content, 'temporary_file_path'):
+            with open(content.temporary_file_path(), 'rb') as source:
+                for block in iter(lambda: source.read(_COPY_BLOCK), b''):
+                    digest.update(block)
+            fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+            os.close(fd)
+            file_move_safe(content.temporary_file_path(), temp_path, allow_overwrite=True)
+        else:
+            fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+            with os.fdopen(fd, 'wb') as target:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for block in content.chunks():
+                    digest.update(block)
+                    target.write(block)
+
+        name = blob_name(digest.hexdigest(), ext)
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        size = os.path.getsize(temp_path)
+
+        try:
+            with transaction.atomic():
+                # The insert takes the row lock a concurrent release() would hold,
+                # so the blob can't be unlinked between this rename and the increment
+                StoredBlob.objects.bulk_create([StoredBlob(name=name, size=size)], ignore_conflicts=True)
+                StoredBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+                if os.path.exists(full_path):
+                    os.remove(temp_path)
+                    # The mtime is the blob's last use, for gc_media's grace period
+                    os.utime(full_path)
+                else:
+                    os.replace(temp_path, full_path)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(full_path, self.file_permissions_mode)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return name
+
+    def delete(self, name):
+        if not is_blob_name(name):
+            super().delete(name)
+            self._delete_variants(name)
+            return
+        self.release(name)
+
+    def release(self, name):
+        """Drop one reference to a blob; the bytes go with the last one."""
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            StoredBlob.objects.filter(name=name).update(refcount=F('refcount') - 1)
+            orphaned, _ = StoredBlob.objects.filter(name=name, refcount__lte=0).delete()
+            if orphaned:
+                super().delete(name)
+                self._delete_variants(name)
+                self._prune_dirs(name)
+
+    def _delete_variants(self, name):
+        # Resized copies (see images.py) live next to the original
+        from .images import variant_names
+
+        for variant in variant_names(name):
+            super().delete(variant)
+
+    def _prune_dirs(self, name):
+        # Remove the shard directories once empty, so listings stay short
+        directory = os.path.dirname(self.path(name))
+        root = self.path(BLOB_ROOT)
+        while directory != root and directory.startswith(root):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+
+
+def file_fields():
+    """``(model, field_name)`` for every field stored through blob_storage."""
+    from django.contrib.auth import get_user_model
+    from .models import Project, ProjectFile
+
+    return [(ProjectFile, 'file'), (Project, 'thumbnail'), (get_user_model(), 'profile_picture')]
+
+
+def referenced_names():
+    """Yield every stored file name the database points at, one per reference."""
+    for model, field in file_fields():
+        # _base_manager: a tombstoned project still holds its thumbnail
+        names = model._base_manager.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+        yield from names.values_list(field, flat=True).iterator(chunk_size=2000)
+
+
+# --- REFERENCE TRACKING ---
+# Every row pointing at a blob holds one reference. Replacing the file or
+# deleting the row gives it back once the transaction commits (the
+# receivers are in signals.py), so refcounts follow the database.
+def _release_later(storage, name):
+    if name:
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+def remember_stored_name(instance, field, update_fields=None):
+    """pre_save: note the name the row holds now, if this save may replace it."""
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and field not in update_fields:
+        return
+    stored = type(instance)._base_manager.filter(pk=instance.pk).values_list(field, flat=True).first()
+    instance.__dict__.setdefault('_stored_names', {})[field] = stored
+
+
+def release_replaced(instance, field):
+    """post_save: release the previous file if the row now points elsewhere."""
+    stored = instance.__dict__.get('_stored_names', {}).pop(field, None)
+    current = getattr(instance, field)
+    if stored and stored != (current.name if current else None):
+        _release_later(current.storage, stored)
+
+
+def release_deleted(instance, field):
+    """post_delete: release the file of a deleted row."""
+    current = getattr(instance, field)
+    if current:
+        _release_later(current.storage, current.name)
+
+
+_blob_storage = None
+
+
+def blob_storage():
+    """Storage for ProjectFile.file, Project.thumbnail and User.profile_picture."""
+    global _blob_storage
+    if _blob_storage is None:
+        _blob_storage = ContentAddressedStorage()
+    return _blob_storage
@@ -1,3 +1,353 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.http import http_date
+
+from .chat import history_page
+from .deletion import purge_batch, purge_next, tombstone_project
+from .downloads import parse_range
+from .models import Project, ProjectFile, ProjectMessage, StoredBlob, UploadSession
+from .recommendations import greedy_cover
+from .search import SQLiteSearchBackend, repair_sqlite_index
+
+User = get_user_model()
+
+
+class MediaTestCase(TestCase):
+    """Runs each test against an empty MEDIA_ROOT of its own."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        parts = mock.patch('projects.uploads.UPLOAD_TEMP_DIR', os.path.join(self.media_root, 'upload_parts'))
+        parts.start()
+        self.addCleanup(parts.stop)
+
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.project = Project.objects.create(owner=self.owner, title='Vault', description='Files')
+        self.client.force_login(self.owner)
+
+    def add_file(self, content, name='notes.enc'):
+        with self.captureOnCommitCallbacks(execute=True):
+            project_file = ProjectFile(project=self.project, uploaded_by=self.owner, name=name)
+            project_file.file.save(name, ContentFile(content))
+        return project_file
+
+
+# --- 1. RANGE DOWNLOADS ---
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=90-500', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-500', 100), (0, 99))
+
+    def test_unsatisfiable(self):
+        self.assertIs(parse_range('bytes=100-', 100), False)
+        self.assertIs(parse_range('bytes=20-10', 100), False)
+        self.assertIs(parse_range('bytes=-0', 100), False)
+
+    def test_ignored(self):
+        # Whole file instead: multi-range, other units, garbage
+        self.assertIsNone(parse_range('bytes=0-1,5-6', 100))
+        self.assertIsNone(parse_range('items=0-1', 100))
+        self.assertIsNone(parse_range('bytes=-', 100))
+
+
+class RangeDownloadTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = bytes(range(256)) * 4
+        self.project_file = self.add_file(self.content)
+        self.url = f'/file/{self.project_file.id}/download/'
+
+    def test_whole_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_single_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.content)}')
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+
+    def test_suffix_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[-5:])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_if_range(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        # The file changed since the client's copy: send all of it
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_if_range_date(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE=last_modified)
+        self.assertEqual(response.status_code, 206)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE=http_date(0))
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_members_only(self):
+        User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.client.login(username='stranger', password='pw')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+# --- 2. CHUNKED UPLOADS ---
+class ChunkedUploadTests(MediaTestCase):
+    content = b'a' * 1000 + b'b' * 500
+
+    def start(self):
+        response = self.client.post(f'/project/{self.project.id}/uploads/', {
+            'name': 'Backup', 'filename': 'backup.enc', 'size': len(self.content),
+        })
+        self.assertEqual(response.status_code, 201)
+        return f"/project/{self.project.id}/uploads/{response.json()['upload_id']}/"
+
+    def put(self, base, offset, data):
+        return self.client.generic('PUT', f'{base}chunk/?offset={offset}', data, content_type='application/octet-stream')
+
+    def finalize(self, base, sha256=None):
+        data = {'size': len(self.content)}
+        if sha256 is not None:
+            data['sha256'] = sha256
+        return self.client.post(f'{base}finalize/', data)
+
+    def test_upload_in_chunks(self):
+        base = self.start()
+        self.assertEqual(self.put(base, 0, self.content[:1000]).json()['offset'], 1000)
+        self.assertEqual(self.put(base, 1000, self.content[1000:]).json()['offset'], 1500)
+
+        response = self.finalize(base, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(response.status_code, 201)
+        project_file = ProjectFile.objects.get(id=response.json()['id'])
+        with project_file.file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.content)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_wrong_offset_says_where_to_resume(self):
+        base = self.start()
+        self.put(base, 0, self.content[:1000])
+        # A retried chunk the server already has
+        response = self.put(base, 0, self.content[:1000])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 1000)
+        # The status request after an interruption
+        self.assertEqual(self.client.get(base).json()['offset'], 1000)
+
+    def test_chunk_past_declared_size(self):
+        base = self.start()
+        response = self.put(base, 0, self.content + b'extra')
+        self.assertEqual(response.status_code, 416)
+
+    def test_finalize_checks(self):
+        base = self.start()
+        self.put(base, 0, self.content[:1000])
+        self.assertEqual(self.finalize(base, hashlib.sha256(self.content).hexdigest()).status_code, 409)
+
+        self.put(base, 1000, self.content[1000:])
+        self.assertEqual(self.finalize(base).status_code, 400)
+        self.assertEqual(self.finalize(base, '0' * 64).status_code, 422)
+        self.assertFalse(ProjectFile.objects.exists())
+
+    def test_removed_member_cannot_continue(self):
+        member = User.objects.create_user(username='member', email='member@example.com', password='pw')
+        self.project.members.add(member)
+        self.client.force_login(member)
+        base = self.start()
+        self.project.members.remove(member)
+        self.assertEqual(self.put(base, 0, self.content[:1000]).status_code, 403)
+
+    def test_deleted_project(self):
+        base = self.start()
+        tombstone_project(self.project)
+        self.assertEqual(self.put(base, 0, self.content[:1000]).status_code, 404)
+
+
+# --- 3. BLOB REFERENCES ---
+class BlobRefcountTests(MediaTestCase):
+    def blob(self, project_file):
+        return StoredBlob.objects.get(name=project_file.file.name)
+
+    def test_identical_files_share_a_blob(self):
+        first = self.add_file(b'same bytes')
+        second = self.add_file(b'same bytes', name='copy.enc')
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(self.blob(first).refcount, 2)
+
+    def test_delete_releases_one_reference(self):
+        first = self.add_file(b'same bytes')
+        second = self.add_file(b'same bytes', name='copy.enc')
+        path = first.file.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.blob(second).refcount, 1)
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_replace_releases_the_old_file(self):
+        project_file = self.add_file(b'version one')
+        old_name, old_path = project_file.file.name, project_file.file.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project_file.file.save('notes.enc', ContentFile(b'version two'))
+        self.assertNotEqual(project_file.file.name, old_name)
+        self.assertFalse(StoredBlob.objects.filter(name=old_name).exists())
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(self.blob(project_file).refcount, 1)
+
+    def test_unrelated_save_keeps_the_reference(self):
+        project_file = self.add_file(b'kept')
+        with self.captureOnCommitCallbacks(execute=True):
+            project_file.name = 'Renamed'
+            project_file.save()
+        self.assertEqual(self.blob(project_file).refcount, 1)
+        self.assertTrue(os.path.exists(project_file.file.path))
+
+
+# --- 4. PROJECT DELETION ---
+class TombstonePurgeTests(MediaTestCase):
+    def test_tombstone_hides_the_project(self):
+        tombstone_project(self.project)
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertTrue(Project.all_objects.filter(pk=self.project.pk).exists())
+
+    def test_purge_in_batches(self):
+        ProjectMessage.objects.bulk_create([
+            ProjectMessage(project=self.project, sender=self.owner, content=f'message {n}') for n in range(5)
+        ])
+        project_file = self.add_file(b'attachment')
+        path = project_file.file.path
+        tombstone_project(self.project)
+
+        # Files go last, so their blobs outlive every other child row
+        self.assertEqual(purge_batch(self.project, batch_size=2), 2)
+        self.assertEqual(purge_batch(self.project, batch_size=2), 2)
+        self.assertEqual(purge_batch(self.project, batch_size=2), 1)
+        self.assertFalse(ProjectMessage.objects.exists())
+        self.assertTrue(ProjectFile.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(purge_batch(self.project, batch_size=2), 1)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(purge_batch(self.project, batch_size=2), 0)
+
+    def test_purge_next(self):
+        ProjectMessage.objects.create(project=self.project, sender=self.owner, content='bye')
+        self.assertIsNone(purge_next())
+        tombstone_project(self.project)
+        self.assertEqual(purge_next(batch_size=1), self.project)
+        self.assertFalse(Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assertIsNone(purge_next())
+
+
+# --- 5. SEARCH INDEX ---
+@skipUnless(connection.vendor == 'sqlite', "FTS5 triggers are SQLite only")
+class SQLiteTriggerRepairTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+
+    def triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'projects_%_fts_%'")
+            return {name for (name,) in cursor.fetchall()}
+
+    def test_nothing_to_repair(self):
+        self.assertFalse(repair_sqlite_index())
+
+    def test_missing_trigger_is_recreated_and_reindexed(self):
+        expected = self.triggers()
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER projects_project_fts_insert")
+        project = Project.objects.create(owner=self.owner, title='Zebra tracker', description='Stripes')
+        self.assertEqual(SQLiteSearchBackend().search('zebra', 10), [])
+
+        self.assertTrue(repair_sqlite_index())
+        self.assertEqual(self.triggers(), expected)
+        self.assertEqual([pk for pk, _ in SQLiteSearchBackend().search('zebra', 10)], [project.pk])
+
+
+# --- 6. CHAT HISTORY ---
+class ChatHistoryTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.project = Project.objects.create(owner=owner, title='Chat', description='Talk')
+        self.ids = [
+            ProjectMessage.objects.create(project=self.project, sender=owner, content=f'message {n}').id
+            for n in range(7)
+        ]
+        other = Project.objects.create(owner=owner, title='Other', description='Elsewhere')
+        ProjectMessage.objects.create(project=other, sender=owner, content='not this one')
+
+    def test_pages_walk_back_through_history(self):
+        messages = self.project.messages.all()
+        page, has_older = history_page(messages, size=3)
+        self.assertEqual([message.id for message in page], self.ids[4:])
+        self.assertTrue(has_older)
+
+        page, has_older = history_page(messages, before=page[0].id, size=3)
+        self.assertEqual([message.id for message in page], self.ids[1:4])
+        self.assertTrue(has_older)
+
+        page, has_older = history_page(messages, before=page[0].id, size=3)
+        self.assertEqual([message.id for message in page], self.ids[:1])
+        self.assertFalse(has_older)
+
+    def test_exact_page(self):
+        page, has_older = history_page(self.project.messages.all(), before=self.ids[3], size=3)
+        self.assertEqual([message.id for message in page], self.ids[:3])
+        self.assertFalse(has_older)
+
+
+# --- 7. TEAMMATE SUGGESTIONS ---
+class GreedyCoverTests(SimpleTestCase):
+    def test_each_pick_covers_the_most_uncovered_skills(self):
+        candidates = {1: 0b0011, 2: 0b0110, 3: 0b1000, 4: 0b1100}
+        # 1 and 2 tie on two bits (lower id wins); then 4 covers the two left
+        self.assertEqual(greedy_cover(0b1111, candidates, limit=2), [(1, 0b0011), (4, 0b1100)])
+
+    def test_best_single_candidate_first(self):
+        candidates = {1: 0b011, 2: 0b100, 3: 0b111}
+        # Once everything is covered the rest follow by overlap with the gap
+        self.assertEqual(greedy_cover(0b111, candidates, limit=3), [(3, 0b111), (1, 0b011), (2, 0b100)])
+
+    def test_only_gap_skills_count(self):
+        candidates = {1: 0b10000, 2: 0b10001}
+        self.assertEqual(greedy_cover(0b0001, candidates), [(2, 0b0001)])
+
+    def test_nothing_to_cover(self):
+        self.assertEqual(greedy_cover(0b11, {1: 0b100}), [])
+        self.assertEqual(greedy_cover(0b11, {}), [])
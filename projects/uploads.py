@@ -0,0 +1,179 @@
+# projects/uploads.py
+# Chunked, resumable uploads for the encrypted file vault.
+#
+#   1. init      -> an UploadSession with the expected total size
+#   2. chunk     -> raw bytes appended at an explicit offset; the reply (or a
+#                   status request after an interruption) says where to resume
+#   3. finalize  -> size and SHA-256 (required) checked, then the partial file
+#                   is moved into storage and becomes a ProjectFile
+# Request bodies are copied to disk in small blocks, never held in memory.
+# Chunks and finalize run with the session row locked, so two requests for
+# the same upload never write the partial file at once, and each re-checks
+# that the project still exists and the uploader is still on its team.
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Project, ProjectFile, UploadSession
+
+# What the browser is told to send per request
+UPLOAD_CHUNK_SIZE = getattr(settings, 'UPLOAD_CHUNK_SIZE', 4 * 1024 * 1024)
+UPLOAD_MAX_CHUNK_SIZE = getattr(settings, 'UPLOAD_MAX_CHUNK_SIZE', 16 * 1024 * 1024)
+UPLOAD_MAX_SIZE = getattr(settings, 'UPLOAD_MAX_SIZE', 1024 * 1024 * 1024)
+# Unfinished uploads untouched this long are removed by cleanup_uploads
+UPLOAD_SESSION_TTL = getattr(settings, 'UPLOAD_SESSION_TTL', timedelta(hours=24))
+UPLOAD_TEMP_DIR = getattr(settings, 'UPLOAD_TEMP_DIR', os.path.join(settings.MEDIA_ROOT, 'upload_parts'))
+
+_COPY_BLOCK = 64 * 1024
+_SHA256_RE = re.compile(r'^[0-9a-fA-F]{64}$')
+
+
+class UploadError(Exception):
+    """Rejected upload request; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+class _PartFile(File):
+    # FileSystemStorage moves a file exposing temporary_file_path() instead of copying it
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def part_path(session):
+    return os.path.join(UPLOAD_TEMP_DIR, f'{session.id}.part')
+
+
+def _lock_session(session):
+    """Re-read ``session`` with its row locked until the transaction ends."""
+    rows = UploadSession.objects.filter(id=session.id)
+    if not connection.features.has_select_for_update:
+        # SQLite has no row locks; a write takes its database lock instead
+        rows.update(updated_at=timezone.now())
+    locked = rows.select_for_update().first()
+    if locked is None:
+        raise UploadError("Upload was cancelled.", status=404)
+    # 🔒 The project may have been deleted, or the uploader removed, since init
+    project = Project.objects.filter(id=locked.project_id).only('owner_id').first()
+    if project is None:
+        raise UploadError("Project no longer exists.", status=410)
+    if project.owner_id != locked.uploaded_by_id and not project.members.filter(id=locked.uploaded_by_id).exists():
+        raise UploadError("Access Denied: You are not a member of this project.", status=403)
+    session.received = locked.received
+    return locked
+
+
+# --- 1. INIT ---
+def start_upload(project, user, name, filename, total_size):
+    if not filename.lower().endswith('.enc'):
+        raise UploadError("Only encrypted .enc files can be uploaded.")
+    if not name:
+        raise UploadError("A display name is required.")
+    if total_size <= 0 or total_size > UPLOAD_MAX_SIZE:
+        raise UploadError(f"File size must be between 1 byte and {UPLOAD_MAX_SIZE} bytes.", status=413)
+
+    session = UploadSession.objects.create(
+        project=project, uploaded_by=user, name=name[:255], filename=os.path.basename(filename)[:255],
+        total_size=total_size,
+    )
+    os.makedirs(UPLOAD_TEMP_DIR, exist_ok=True)
+    open(part_path(session), 'wb').close()
+    return session
+
+
+# --- 2. CHUNKS ---
+def append_chunk(session, offset, stream, length):
+    """Write ``length`` bytes from ``stream`` at ``offset``. Returns the new offset.
+
+    The offset must be exactly what the server has already received; a
+    client that lost track gets a 409 carrying the offset to resume from.
+    """
+    if length <= 0 or length > UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(f"Chunks must be between 1 and {UPLOAD_MAX_CHUNK_SIZE} bytes.", status=413)
+
+    with transaction.atomic():
+        # A concurrent request for the same upload waits here, then sees the new offset
+        locked = _lock_session(session)
+        if offset != locked.received:
+            raise UploadError("Offset does not match the bytes received so far.", status=409, offset=locked.received)
+        if offset + length > locked.total_size:
+            raise UploadError("Chunk runs past the declared file size.", status=416, offset=locked.received)
+
+        written = 0
+        with open(part_path(locked), 'r+b') as part:
+            # Anything past the confirmed offset is left over from an interrupted chunk
+            part.truncate(offset)
+            part.seek(offset)
+            while written < length:
+                block = stream.read(min(_COPY_BLOCK, length - written))
+                if not block:
+                    break
+                part.write(block)
+                written += len(block)
+
+        if written != length:
+            raise UploadError("Chunk body was shorter than its Content-Length.", offset=locked.received)
+
+        UploadSession.objects.filter(id=locked.id).update(received=offset + written, updated_at=timezone.now())
+    session.received = offset + written
+    return session.received
+
+
+# --- 3. FINALIZE / ABORT ---
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize_upload(session, size, sha256):
+    """Verify the upload and turn it into a ProjectFile."""
+    if not _SHA256_RE.match(sha256 or ''):
+        raise UploadError("The SHA-256 of the whole file (64 hex digits) is required.")
+
+    path = part_path(session)
+    with transaction.atomic():
+        locked = _lock_session(session)
+        if size != locked.total_size or locked.received != locked.total_size:
+            raise UploadError("Upload is incomplete.", status=409, offset=locked.received)
+        if file_sha256(path) != sha256.lower():
+            raise UploadError("Checksum mismatch: the uploaded bytes are corrupted.", status=422)
+
+        project_file = ProjectFile(project=session.project, uploaded_by=session.uploaded_by, name=session.name)
+        with open(path, 'rb') as part:
+            project_file.file.save(session.filename, _PartFile(part), save=False)
+        project_file.save()
+        locked.delete()
+
+    if os.path.exists(path):
+        # Storage backends that copy (instead of move) leave the part behind
+        os.remove(path)
+    return project_file
+
+
+def abort_upload(session):
+    path = part_path(session)
+    session.delete()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def expire_stale_uploads(older_than=UPLOAD_SESSION_TTL):
+    """Remove unfinished uploads idle for longer than ``older_than``. Returns the count."""
+    stale = UploadSession.objects.filter(updated_at__lt=timezone.now() - older_than)
+    count = 0
+    for session in stale.iterator():
+        abort_upload(session)
+        count += 1
+    return count
@@ -1,27 +1,57 @@
-from django.shortcuts import render, get_object_or_404, redirect
-from django.db.models import Count, Q
+import json
+
+from django.shortcuts import render, get_object_or_404, redirect, aget_object_or_404
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.views.decorators.http import require_http_methods, require_POST
 
 # Cleaned up and consolidated imports
-from .models import Project, ProjectFile, ProjectMessage
+from .models import Project, ProjectFile, ProjectMessage, UploadSession
 from .forms import ProjectForm, FileUploadForm, MessageForm
+from .chat import CHAT_MAX_WINDOW, history_page, search_history
+from .matching import MATCHMAKING_PAGE_SIZE, MatchResults, build_cards, ranked_matches
+from .realtime import KEEPALIVE_SECONDS, channel_for, get_broker, publish
+from .search import search_projects
+from .skills import SKILL_AUTOCOMPLETE_LIMIT, complete_skill
+from .deletion import tombstone_project
+from .recommendations import recommended_teammates
+from .downloads import serve_project_file
+from .uploads import UPLOAD_CHUNK_SIZE, UploadError, abort_upload, append_chunk, finalize_upload, start_upload
 
 # --- 1. MATCHMAKING LOGIC ---
 def project_matchmaking(request):
-    if request.user.is_authenticated:
-        user_skills = request.user.skills.all()
-        
-        if not user_skills:
-            matches = Project.objects.all()
-        else:
-            matches = Project.objects.annotate(
-                match_count=Count('required_skills', filter=Q(required_skills__in=user_skills))
-            ).order_by('-match_count', '-created_at')
+    query = request.GET.get('q', '').strip()[:200]
+    if query:
+        # Keyword search: text relevance first, nudged by skill match
+        results = MatchResults(search_projects(request.user, query), include_rest=False)
     else:
-        matches = Project.objects.all()
+        # Scores are skill-bitset overlaps of the projects sharing a skill
+        # (matching.score_candidates); the rest follow newest-first.
+        results = MatchResults(ranked_matches(request.user) if request.user.is_authenticated else [])
+
+    paginator = Paginator(results, MATCHMAKING_PAGE_SIZE)
+    page_obj = paginator.get_page(request.GET.get('page'))
 
-    return render(request, 'projects/matchmaking.html', {'projects': matches})
+    return render(request, 'projects/matchmaking.html', {
+        'projects': build_cards(page_obj.object_list, request.user),
+        'page_obj': page_obj,
+        'query': query,
+    })
+
+@require_http_methods(['GET'])
+def skill_autocomplete(request):
+    # Answered from the in-process prefix index (skills.py), no DB query
+    try:
+        limit = min(max(int(request.GET.get('limit', SKILL_AUTOCOMPLETE_LIMIT)), 1), 50)
+    except ValueError:
+        limit = SKILL_AUTOCOMPLETE_LIMIT
+    results = complete_skill(request.GET.get('q', '')[:100], limit)
+    response = JsonResponse({'results': [{'name': name, 'count': count} for name, count in results]})
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
 
 # --- 2. JOIN REQUEST LOGIC ---
 @login_required
@@ -54,7 +84,11 @@ def manage_team(request, project_id):
         except:
             pass 
             
-    return render(request, 'projects/manage_team.html', {'project': project})
+    return render(request, 'projects/manage_team.html', {
+        'project': project,
+        # Precomputed by refresh_team_recommendations into TeamRecommendation
+        'suggested_users': recommended_teammates(project),
+    })
 
 # --- 4. CREATE PROJECT ---
 @login_required
@@ -119,6 +153,114 @@ def project_files(request, project_id):
 
     return render(request, 'projects/files.html', {'project': project, 'files': files, 'form': form})
 
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+def download_project_file(request, file_id):
+    file_obj = get_object_or_404(
+        ProjectFile.objects.select_related('project'), id=file_id, project__deleted_at__isnull=True
+    )
+    project = file_obj.project
+
+    # 🔒 THE BOUNCER: Security Check
+    if request.user != project.owner and not project.members.filter(id=request.user.id).exists():
+        return HttpResponseForbidden("Access Denied: You are not a member of this project.")
+
+    return serve_project_file(request, file_obj)
+
+# --- 6b. CHUNKED UPLOADS (protocol in uploads.py) ---
+def _upload_error(error):
+    body = {'error': str(error)}
+    if error.offset is not None:
+        body['offset'] = error.offset
+    return JsonResponse(body, status=error.status)
+
+def _upload_status(session):
+    return {
+        'upload_id': str(session.id),
+        'offset': session.received,
+        'size': session.total_size,
+        'chunk_size': UPLOAD_CHUNK_SIZE,
+    }
+
+def _upload_session(request, project_id, upload_id):
+    session = get_object_or_404(
+        UploadSession.objects.select_related('project'),
+        id=upload_id, project_id=project_id, project__deleted_at__isnull=True,
+    )
+    # 🔒 Only the member who started an upload can continue it
+    if session.uploaded_by_id != request.user.id:
+        return None
+    return session
+
+@login_required
+@require_POST
+def upload_init(request, project_id):
+    project = get_object_or_404(Project, id=project_id)
+
+    # 🔒 THE BOUNCER: Security Check
+    if request.user != project.owner and not project.members.filter(id=request.user.id).exists():
+        return JsonResponse({'error': "Access Denied: You are not a member of this project."}, status=403)
+
+    size = request.POST.get('size', '')
+    try:
+        session = start_upload(
+            project, request.user,
+            name=request.POST.get('name', '').strip(),
+            filename=request.POST.get('filename', ''),
+            total_size=int(size) if size.isdigit() else 0,
+        )
+    except UploadError as e:
+        return _upload_error(e)
+    return JsonResponse(_upload_status(session), status=201)
+
+@login_required
+@require_http_methods(['GET', 'DELETE'])
+def upload_detail(request, project_id, upload_id):
+    session = _upload_session(request, project_id, upload_id)
+    if session is None:
+        return JsonResponse({'error': "Access Denied."}, status=403)
+
+    if request.method == 'DELETE':
+        abort_upload(session)
+        return HttpResponse(status=204)
+    # Where to resume after an interruption
+    return JsonResponse(_upload_status(session))
+
+@login_required
+@require_http_methods(['PUT', 'POST'])
+def upload_chunk(request, project_id, upload_id):
+    session = _upload_session(request, project_id, upload_id)
+    if session is None:
+        return JsonResponse({'error': "Access Denied."}, status=403)
+
+    offset = request.GET.get('offset', '')
+    length = request.META.get('CONTENT_LENGTH', '')
+    if not offset.isdigit() or not length.isdigit():
+        return JsonResponse({'error': "offset and Content-Length are required."}, status=400)
+
+    try:
+        # request (not request.body) is read in blocks straight into the partial file
+        append_chunk(session, int(offset), request, int(length))
+    except UploadError as e:
+        return _upload_error(e)
+    return JsonResponse(_upload_status(session))
+
+@login_required
+@require_POST
+def upload_finalize(request, project_id, upload_id):
+    session = _upload_session(request, project_id, upload_id)
+    if session is None:
+        return JsonResponse({'error': "Access Denied."}, status=403)
+
+    size = request.POST.get('size', '')
+    try:
+        project_file = finalize_upload(
+            session, int(size) if size.isdigit() else -1, request.POST.get('sha256', '').strip()
+        )
+    except UploadError as e:
+        return _upload_error(e)
+    return JsonResponse({'id': project_file.id, 'name': project_file.name}, status=201)
+
 # --- 7. PROJECT CHAT ---
 @login_required
 def project_chat(request, project_id):
@@ -130,7 +272,8 @@ def project_chat(request, project_id):
         return redirect('find_projects')
 
     # Changed variable name to messages_list so it doesn't conflict with Django messages
-    messages_list = project.messages.all().order_by('created_at')
+    # Ordered by id (same order as created_at) so the (project, id) index serves it
+    messages_list = project.messages.select_related('sender').order_by('id')
     
     if request.method == "POST":
         form = MessageForm(request.POST)
@@ -139,19 +282,103 @@ def project_chat(request, project_id):
             msg.project = project
             msg.sender = request.user
             msg.save()
+            publish(project.id, 'chat', id=msg.id)
             return redirect('project_chat', project_id=project_id)
     else:
         form = MessageForm()
 
     if request.headers.get('HX-Request'):
-        return render(request, 'projects/chat_partial.html', {'messages': messages_list, 'user': request.user})
+        # Scroll-up: the page of history just before the oldest rendered message
+        before = request.GET.get('before', '')
+        if before.isdigit():
+            page, has_older = history_page(messages_list, before=int(before))
+            return render(request, 'projects/chat_messages.html', {
+                'project': project, 'messages': page, 'has_older': has_older, 'user': request.user,
+            })
+
+        # Delta poll: the client sends the id of the last message it has
+        after = request.GET.get('after', '')
+        if after.isdigit():
+            new_messages = list(messages_list.filter(id__gt=int(after))[:CHAT_MAX_WINDOW + 1])
+            if not new_messages:
+                return HttpResponse(status=204)
+            if len(new_messages) <= CHAT_MAX_WINDOW:
+                return render(request, 'projects/chat_messages.html', {'messages': new_messages, 'user': request.user})
+            # Too far behind to catch up message by message: reset to the latest window
+            page, has_older = history_page(messages_list)
+            response = render(request, 'projects/chat_partial.html', {
+                'project': project, 'messages': page, 'has_older': has_older, 'user': request.user,
+            })
+            response['HX-Reswap'] = 'innerHTML scroll:bottom'
+            return response
+
+    # Only the newest page is rendered; older history loads on scroll-up
+    page, has_older = history_page(messages_list)
+
+    if request.headers.get('HX-Request'):
+        return render(request, 'projects/chat_partial.html', {
+            'project': project, 'messages': page, 'has_older': has_older, 'user': request.user,
+        })
 
     return render(request, 'projects/chat.html', {
         'project': project, 
-        'messages': messages_list, 
-        'form': form
+        'messages': page, 
+        'has_older': has_older,
+        'max_window': CHAT_MAX_WINDOW,
+        'form': form,
+        'realtime': settings.REALTIME_ENABLED,
+    })
+
+@login_required
+def project_chat_search(request, project_id):
+    project = get_object_or_404(Project, id=project_id)
+
+    # 🔒 THE BOUNCER: Security Check (same rule as the chat itself)
+    if request.user != project.owner and not project.members.filter(id=request.user.id).exists():
+        return HttpResponseForbidden("Access Denied: You are not a member of this project.")
+
+    query = request.GET.get('q', '').strip()[:200]
+    before = request.GET.get('before', '')
+    hits, has_more = [], False
+    if query:
+        hits, has_more = search_history(project, query, before=int(before) if before.isdigit() else None)
+
+    return render(request, 'projects/chat_search_results.html', {
+        'project': project, 'query': query, 'hits': hits, 'has_more': has_more,
+        'paged': before.isdigit(), 'user': request.user,
     })
 
+# --- 7b. LIVE PROJECT EVENTS (SSE) ---
+@login_required
+async def project_events(request, project_id):
+    project = await aget_object_or_404(Project, id=project_id)
+    user = await request.auser()
+
+    # 🔒 Same bouncer as chat/files, written with the async ORM
+    if user.id != project.owner_id and not await project.members.filter(id=user.id).aexists():
+        return HttpResponseForbidden()
+    if not settings.REALTIME_ENABLED:
+        return HttpResponse(status=204)
+
+    async def stream():
+        subscription = get_broker().subscribe(channel_for(project.id))
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                event = await subscription.get(KEEPALIVE_SECONDS)
+                if event is None:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ': keep-alive\n\n'
+                else:
+                    yield f"event: {event['kind']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 # --- 8. DELETE PROJECT ---
 @login_required
 def delete_project(request, project_id):
@@ -159,7 +386,8 @@ def delete_project(request, project_id):
     
     # Security: Only the owner can delete the project
     if request.user == project.owner:
-        project.delete()
+        # Hidden right away; tasks, messages and files are purged in the background
+        tombstone_project(project)
         messages.success(request, "Project deleted successfully.")
     else:
         messages.error(request, "Access Denied: Only the project admin can delete this project.")
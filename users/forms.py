@@ -2,7 +2,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
-from taggit.forms import TagWidget # <--- IMPORT ADDED HERE
+from projects.forms import SkillTagWidget
 
 # Get the custom User model dynamically
 User = get_user_model()
@@ -11,7 +11,8 @@ class StudentSignUpForm(UserCreationForm):
     # Add an extra field for skills during sign up
     skills = forms.CharField(
         help_text="Separate skills with commas (e.g. Python, Design, Marketing)",
-        required=False
+        required=False,
+        widget=SkillTagWidget(),
     )
 
     class Meta(UserCreationForm.Meta):
@@ -42,7 +43,7 @@ class ProfileUpdateForm(forms.ModelForm):
             'portfolio_link': forms.URLInput(attrs={'class': 'w-full border border-gray-300 p-2 rounded focus:ring-2 focus:ring-indigo-500', 'placeholder': 'https://...'}),
             
             # --- FIX: Using TagWidget instead of normal TextInput ---
-            'skills': TagWidget(attrs={'class': 'w-full border border-gray-300 p-2 rounded focus:ring-2 focus:ring-indigo-500', 'placeholder': 'e.g. Python, Bootstrap, Android Studio'}),
+            'skills': SkillTagWidget(attrs={'class': 'w-full border border-gray-300 p-2 rounded focus:ring-2 focus:ring-indigo-500', 'placeholder': 'e.g. Python, Bootstrap, Android Studio'}),
             
             'bio': forms.Textarea(attrs={'class': 'w-full border border-gray-300 p-2 rounded focus:ring-2 focus:ring-indigo-500', 'rows': 4, 'placeholder': 'Passionate about building AI models, Java applications...'}),
             'profile_picture': forms.FileInput(attrs={'class': 'w-full border border-gray-300 p-2 rounded bg-gray-50'}),
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:56
+
+import projects.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_bio_user_profile_picture_alter_user_skills'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.ImageField(blank=True, help_text='Upload a professional photo or avatar.', null=True, storage=projects.storage.blob_storage, upload_to='profile_pics/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_profile_picture_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='skill_mask',
+            field=models.BinaryField(default=b''),
+        ),
+    ]
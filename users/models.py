@@ -2,6 +2,9 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from taggit.managers import TaggableManager
 
+from projects.images import srcset
+from projects.storage import blob_storage
+
 class User(AbstractUser):
     is_student = models.BooleanField(default=True)
     skills = TaggableManager(help_text="e.g., Python, React, Data Analysis", blank=True) 
@@ -10,10 +13,16 @@ class User(AbstractUser):
     # --- NEW PROFILE FIELDS ---
     profile_picture = models.ImageField(
         upload_to='profile_pics/', 
+        storage=blob_storage,
         blank=True, 
         null=True,
         help_text="Upload a professional photo or avatar."
     )
+    # Packed bitset of skills over projects.SkillBit ids (see projects/skills.py)
+    skill_mask = models.BinaryField(default=b'', editable=False)
+
+    # {"name": <picture it was made from>, "widths": [...]}, filled in by projects/images.py
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     bio = models.TextField(
         blank=True, 
@@ -21,4 +30,8 @@ class User(AbstractUser):
     )
 
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+    @property
+    def profile_picture_srcset(self):
+        return srcset(self.profile_picture, self.profile_picture_variants, 'avatar')
\ No newline at end of file